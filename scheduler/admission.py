@@ -0,0 +1,121 @@
+"""
+Resource-aware admission control for the scheduler.
+
+Before a run starts it has to be admitted: the host's CPU load (1-minute load
+average per CPU), available memory and number of processes must all be within
+the configured limits. Until they are, the run stays queued and the check is
+repeated every poll interval. Admissions are spaced by one poll interval too,
+so the browser a just-admitted run starts has time to show up in the numbers
+before the next run is let in.
+
+Host readings come from /proc on Linux; a limit whose reading is not available
+on this platform (e.g. MemAvailable on macOS) is not enforced.
+"""
+
+import asyncio
+import os
+import time
+
+
+def load_per_cpu() -> float | None:
+    """1-minute load average divided by the number of CPUs."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+
+def available_memory_mb() -> float | None:
+    """Memory available for new processes without swapping (MemAvailable)."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def process_count() -> int | None:
+    """Number of processes running on the host."""
+    try:
+        return sum(1 for entry in os.listdir("/proc") if entry.isdigit())
+    except OSError:
+        return None
+
+
+class AdmissionController:
+    """Holds runs back while the host is over any of its resource limits."""
+
+    def __init__(
+        self,
+        max_load: float = 0,
+        min_available_mb: float = 0,
+        max_processes: int = 0,
+        poll_interval: float = 2.0,
+    ):
+        self.max_load = max_load
+        self.min_available_mb = min_available_mb
+        self.max_processes = max_processes
+        self.poll_interval = poll_interval
+        # Runs currently waiting to be admitted
+        self.waiting = 0
+        self._lock = asyncio.Lock()
+        self._last_admitted = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_load or self.min_available_mb or self.max_processes)
+
+    def blocked_by(self) -> str | None:
+        """Describe the first exceeded limit, or None if a run may start."""
+        if self.max_load:
+            load = load_per_cpu()
+            if load is not None and load > self.max_load:
+                return f"load {load:.2f} per CPU > {self.max_load:g}"
+        if self.min_available_mb:
+            available = available_memory_mb()
+            if available is not None and available < self.min_available_mb:
+                return (
+                    f"{available:.0f} MB memory available "
+                    f"< {self.min_available_mb:g} MB"
+                )
+        if self.max_processes:
+            processes = process_count()
+            if processes is not None and processes > self.max_processes:
+                return f"{processes} processes > {self.max_processes}"
+        return None
+
+    async def admit(self, on_blocked=None) -> float:
+        """
+        Wait until a run may start.
+
+        `on_blocked(reason)` is called once if the run has to wait.
+
+        Returns:
+            float: Seconds spent waiting for admission
+        """
+        if not self.enabled:
+            return 0.0
+
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            # One run is admitted at a time, in queue order
+            async with self._lock:
+                settle = self._last_admitted + self.poll_interval - time.monotonic()
+                if settle > 0:
+                    await asyncio.sleep(settle)
+
+                reason = self.blocked_by()
+                if reason is not None and on_blocked is not None:
+                    on_blocked(reason)
+                while reason is not None:
+                    await asyncio.sleep(self.poll_interval)
+                    reason = self.blocked_by()
+
+                self._last_admitted = time.monotonic()
+        finally:
+            self.waiting -= 1
+        return time.monotonic() - started
@@ -0,0 +1,107 @@
+"""
+Result channel between scheduled agents and the scheduler.
+
+The scheduler gives every run its own channel, so overlapping runs and
+multiple schedulers never share a file. Agents report what they are doing
+with the helpers below; each call is sent immediately as one JSON line, so
+the scheduler sees progress while the agent is still running.
+
+Message schema (every message has these fields):
+- type: "progress", "partial" or "result"
+- run_id: SCHEDULER_RUN_ID of the current run
+- script: name of the agent script
+- time: Unix timestamp when the message was sent
+
+Type-specific fields:
+- progress: "message" (str)
+- partial: "result" (any JSON value, e.g. data extracted so far)
+- result: "success" (bool) and "result" (str) - the final outcome, sent once;
+  optionally "metrics" (dict) with run measurements such as wall_seconds,
+  provisioning_seconds, steps and result_bytes (see _runtime.py)
+
+Transport: JSON lines written to the file descriptor in SCHEDULER_RESULT_FD,
+or handed to an in-process sink when the scheduler runs the agent inside its
+own event loop. When the agent is started by hand (no scheduler), messages
+are printed to stdout instead.
+
+Agents with dependencies (DEPENDS_ON = ["gmail.py"]) read the results of
+their upstream agents with upstream_results(); the scheduler passes them in
+SCHEDULER_UPSTREAM_RESULTS, or directly for in-process runs.
+
+This file starts with _ so the scheduler does not run it as an agent.
+"""
+
+import json
+import os
+import sys
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable
+
+# Set by the scheduler for agents running in-process
+current_sink: ContextVar[Callable[[dict], None] | None] = ContextVar(
+    "current_sink", default=None
+)
+current_upstream: ContextVar[dict[str, str] | None] = ContextVar(
+    "current_upstream", default=None
+)
+
+
+def emit(message_type: str, **fields: Any):
+    """Send one message on the current run's channel."""
+    message = {
+        "type": message_type,
+        "run_id": os.getenv("SCHEDULER_RUN_ID"),
+        "script": os.getenv("SCHEDULER_SCRIPT", Path(sys.argv[0]).name),
+        "time": time.time(),
+        **fields,
+    }
+
+    sink = current_sink.get()
+    if sink is not None:
+        sink(message)
+        return
+
+    result_fd = os.getenv("SCHEDULER_RESULT_FD")
+    if result_fd is None:
+        # Not started by the scheduler - just show what happened
+        if message_type == "result":
+            print(message["result"])
+        elif message_type == "progress":
+            print(message["message"])
+        return
+
+    # One write per message keeps lines whole (the fd is shared, never closed)
+    os.write(int(result_fd), (json.dumps(message, default=str) + "\n").encode())
+
+
+def report_progress(message: str):
+    """Report what the agent is doing right now."""
+    emit("progress", message=message)
+
+
+def report_partial(result: Any):
+    """Report an intermediate result before the run is finished."""
+    emit("partial", result=result)
+
+
+def report_result(success: bool, result: str, metrics: dict | None = None):
+    """Report the final outcome of the run."""
+    if metrics is None:
+        emit("result", success=success, result=result)
+    else:
+        emit("result", success=success, result=result, metrics=metrics)
+
+
+def upstream_results() -> dict[str, str]:
+    """
+    Results of the agents this one depends on, by script name.
+
+    Empty when the agent was not started by the scheduler after its upstream
+    agents (e.g. when it is run by hand).
+    """
+    results = current_upstream.get()
+    if results is not None:
+        return results
+    return json.loads(os.getenv("SCHEDULER_UPSTREAM_RESULTS", "{}"))
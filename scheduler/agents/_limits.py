@@ -0,0 +1,82 @@
+"""
+Client for the scheduler's shared rate and budget limits.
+
+Before an agent creates a cloud sandbox or calls its LLM it asks the
+scheduler for a token; the scheduler queues the request until the shared
+rate allows it (see limits.py in the scheduler). Agents also report what a
+run cost, so the scheduler can enforce its daily budget. @scheduled_agent in
+_runtime.py asks for the sandbox and reports the cost for you; wrap the LLM
+with limited_llm() to limit its calls:
+
+    llm = limited_llm(ChatBrowserUse())
+
+When the agent runs without a scheduler, or the scheduler has no limits
+configured (no SCHEDULER_LIMITER_SOCKET), every request is granted at once.
+
+This file starts with _ so the scheduler does not run it as an agent.
+"""
+
+import asyncio
+import json
+import os
+from typing import Any
+
+
+class LimitExceeded(Exception):
+    """The scheduler refused the request, e.g. because the daily budget is spent."""
+
+
+async def request(message: dict) -> dict | None:
+    """Send one request to the scheduler's limiter and wait for the reply."""
+    path = os.getenv("SCHEDULER_LIMITER_SOCKET")
+    if not path:
+        return None
+    try:
+        reader, writer = await asyncio.open_unix_connection(path)
+    except OSError:
+        # The scheduler is gone; don't hold the agent back
+        return None
+    try:
+        writer.write((json.dumps(message) + "\n").encode())
+        await writer.drain()
+        line = await reader.readline()
+    finally:
+        writer.close()
+    return json.loads(line) if line else None
+
+
+async def acquire(resource: str, amount: float = 1) -> float:
+    """
+    Wait for the scheduler's permission to use a resource ("sandbox" or "llm").
+
+    Returns:
+        float: Seconds spent waiting for the shared rate limit
+
+    Raises:
+        LimitExceeded: If the scheduler refused the request
+    """
+    reply = await request({"acquire": resource, "amount": amount})
+    if reply is None:
+        return 0.0
+    if not reply.get("granted", True):
+        raise LimitExceeded(reply.get("reason", f"{resource} limit exceeded"))
+    return reply.get("waited", 0.0)
+
+
+async def record_cost(amount: float):
+    """Report money (USD) this run spent, counted against the daily budget."""
+    if amount:
+        await request({"spend": amount})
+
+
+def limited_llm(llm: Any) -> Any:
+    """Make every ainvoke() of a browser_use chat model wait for an "llm" token."""
+    original = llm.ainvoke
+
+    async def ainvoke(*args, **kwargs):
+        await acquire("llm")
+        return await original(*args, **kwargs)
+
+    # Patch the instance (not a wrapper) so type checks on the model still pass
+    object.__setattr__(llm, "ainvoke", ainvoke)
+    return llm
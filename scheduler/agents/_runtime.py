@@ -0,0 +1,161 @@
+"""
+Shared runtime for scheduled agents.
+
+Decorate an agent's main function with @scheduled_agent instead of @sandbox
+and it gets the scheduler plumbing for free: the function runs in a cloud
+sandbox, exceptions are turned into failed results, and every run reports its
+result together with timing fields in one schema.
+
+    @scheduled_agent(cloud_profile_id=os.getenv("CLOUD_PROFILE_ID"))
+    async def main(browser: Browser):
+        history = await Agent(browser=browser, task=task, llm=llm).run()
+        # Extract results BEFORE returning (while still in the sandbox)
+        return {"result": history.final_result(), "steps": history.number_of_steps()}
+
+    if __name__ == "__main__":
+        asyncio.run(main())
+
+The function may return a string or a dict with "result" and optionally
+"steps" and "cost" (USD spent by the run, counted against the scheduler's
+daily budget).
+
+Before a sandbox is provisioned the runtime asks the scheduler for a
+"sandbox" token (see _limits.py), so concurrent agents queue behind the
+shared provisioning rate instead of running into 429s; a run refused because
+the daily budget is spent fails without starting a browser.
+
+When the scheduler hands the run a warm browser (agents opt in with a
+module-level KEEP_BROWSER_WARM = True, see the scheduler's
+SCHEDULER_BROWSER_IDLE_TTL), the function runs locally against that browser
+through Browser(cdp_url=SCHEDULER_BROWSER_CDP_URL) instead of in a fresh
+sandbox, and the browser is left running for the next run.
+
+The "metrics" field of the result message (see _channel.py) holds:
+- wall_seconds: total run time, including sandbox provisioning
+- provisioning_seconds: time until the sandbox browser was created, or until
+  the warm browser was connected (None if there was no browser)
+- warm_browser: whether the run reused a browser kept warm by the scheduler
+- steps: number of agent steps (None if the agent did not report it)
+- result_bytes: size of the result text in bytes
+- rate_limit_seconds: time spent waiting for the shared sandbox rate limit
+- cost: USD spent by the run (None if the agent did not report it)
+
+This file starts with _ so the scheduler does not run it as an agent.
+"""
+
+import functools
+import os
+import time
+import traceback
+from typing import Any, Awaitable, Callable
+
+from browser_use import Browser, sandbox
+
+from _channel import report_progress, report_result
+from _limits import LimitExceeded, acquire, record_cost
+
+
+def unpack_result(output: Any) -> tuple[str | None, int | None, float | None]:
+    """Split what the agent function returned into (result, steps, cost)."""
+    if isinstance(output, dict):
+        return output.get("result"), output.get("steps"), output.get("cost")
+    return output, None, None
+
+
+async def run_on_warm_browser(
+    function: Callable[..., Awaitable[Any]], cdp_url: str, on_connected: Callable
+) -> Any:
+    """Run the agent function locally against a browser kept warm by the scheduler."""
+    browser = Browser(cdp_url=cdp_url, keep_alive=True)
+    await browser.start()
+    on_connected()
+    try:
+        return await function(browser)
+    finally:
+        # Disconnect only - keep_alive leaves the browser running for the next run
+        await browser.stop()
+
+
+def scheduled_agent(
+    **sandbox_options: Any,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[[], Awaitable[str]]]:
+    """
+    Turn an agent function into a scheduler entry point.
+
+    Keyword arguments are passed to @sandbox. The returned coroutine function
+    takes no arguments, reports the run's result with its metrics and
+    returns the result text.
+    """
+    user_callback = sandbox_options.pop("on_browser_created", None)
+
+    def decorator(function: Callable[..., Awaitable[Any]]):
+        @functools.wraps(function)
+        async def run() -> str:
+            started = time.monotonic()
+            provisioned_at = None
+
+            def on_browser_created(data):
+                nonlocal provisioned_at
+                provisioned_at = time.monotonic()
+                report_progress(f"Browser ready: {data.live_url}")
+                if user_callback is not None:
+                    user_callback(data)
+
+            def on_connected():
+                nonlocal provisioned_at
+                provisioned_at = time.monotonic()
+
+            cdp_url = os.getenv("SCHEDULER_BROWSER_CDP_URL")
+            warm_browser = (
+                cdp_url is not None and os.getenv("SCHEDULER_BROWSER_REUSED") == "1"
+            )
+
+            report_progress("Starting agent")
+            steps = cost = None
+            rate_limit_seconds = 0.0
+            try:
+                if cdp_url:
+                    output = await run_on_warm_browser(function, cdp_url, on_connected)
+                else:
+                    rate_limit_seconds = await acquire("sandbox")
+                    if rate_limit_seconds >= 1:
+                        report_progress(
+                            f"Waited {rate_limit_seconds:.1f}s for a sandbox slot"
+                        )
+                    sandboxed = sandbox(
+                        on_browser_created=on_browser_created, **sandbox_options
+                    )(function)
+                    output = await sandboxed()
+                result, steps, cost = unpack_result(output)
+                success = bool(result)
+                result = str(result) if result else "No result from agent"
+            except LimitExceeded as e:
+                success = False
+                result = f"Not started: {e}"
+            except Exception as e:
+                success = False
+                result = f"Error: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
+
+            if cost:
+                await record_cost(cost)
+
+            report_result(
+                success=success,
+                result=result,
+                metrics={
+                    "wall_seconds": time.monotonic() - started,
+                    "provisioning_seconds": (
+                        provisioned_at - started if provisioned_at else None
+                    ),
+                    "warm_browser": warm_browser,
+                    "steps": steps,
+                    "result_bytes": len(result.encode()),
+                    "rate_limit_seconds": rate_limit_seconds,
+                    "cost": cost,
+                },
+            )
+            return result
+
+        return run
+
+    return decorator
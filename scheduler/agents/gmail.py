@@ -17,16 +17,21 @@ Configuration is loaded from environment variables via .env file:
 - CLOUD_TIMEOUT: Maximum browser session time in minutes
 """
 
-from browser_use import Agent, Browser, ChatBrowserUse, sandbox
+from browser_use import Agent, Browser, ChatBrowserUse
 from dotenv import load_dotenv
+import asyncio
 import os
-import json
-from pathlib import Path
+
+from _runtime import scheduled_agent
 
 load_dotenv()
 
+# Runs every few minutes with the same profile - let the scheduler keep the
+# logged-in browser warm between runs (see SCHEDULER_BROWSER_IDLE_TTL)
+KEEP_BROWSER_WARM = True
+
 
-@sandbox(
+@scheduled_agent(
     cloud_profile_id=os.getenv("CLOUD_PROFILE_ID"),
     cloud_proxy_country_code=os.getenv("CLOUD_PROXY_COUNTRY_CODE"),
     cloud_timeout=int(os.getenv("CLOUD_TIMEOUT", 60)),
@@ -49,43 +54,9 @@ async def main(browser: Browser):
 
     history = await agent.run()
 
-    # Extract final result BEFORE returning (while still in sandbox)
-    return {"result": history.final_result() or "No result from agent"}
-
-
-async def run():
-    """Wrapper function that calls main and writes results to file."""
-    output_file = Path("/tmp") / "gmail.py_result.json"
-
-    try:
-        # Call the sandbox-decorated function (returns dict from sandbox)
-        result = await main()
-
-        result_data = {
-            "script": "gmail.py",
-            "success": bool(result and result.get("result")),
-            "result": result.get("result")
-            if result
-            else "No result returned from agent",
-        }
-
-        with open(output_file, "w") as f:
-            json.dump(result_data, f, indent=2)
-
-    except Exception as e:
-        # Write error result
-        import traceback
-
-        error_data = {
-            "script": "gmail.py",
-            "success": False,
-            "result": f"Error: {str(e)}\n\nTraceback:\n{traceback.format_exc()}",
-        }
-        with open(output_file, "w") as f:
-            json.dump(error_data, f, indent=2)
+    # Extract results BEFORE returning (while still in sandbox)
+    return {"result": history.final_result(), "steps": history.number_of_steps()}
 
 
 if __name__ == "__main__":
-    import asyncio
-
-    asyncio.run(run())
+    asyncio.run(main())
@@ -0,0 +1,364 @@
+"""
+Offline scale benchmark for the scheduler.
+
+Generates N synthetic agents into a temporary scripts directory, runs the real
+scheduler (main.py) against them for a while and reports:
+- throughput: finished runs per second
+- schedule lag: delay between a run's planned fire time and its actual start
+- spawn latency: time from dispatch until the agent reported its first message
+- peak RSS of the scheduler process and of its whole process tree
+
+The synthetic agents need no API keys or network access:
+- sleep: sleeps 0.5-2s, then reports a result
+- cpu: burns 0.5s of CPU time
+- crash: raises an exception
+- hang: never finishes (killed by SCHEDULER_TIMEOUT)
+- output: prints ~2 MB of output
+
+Agents are async main() coroutines, so every execution mode can run them. In
+"inprocess" mode the cpu and output agents block the scheduler's event loop
+while they run, just like blocking code in a real in-process agent would.
+
+Usage:
+    uv run benchmark.py --agents 500 --duration 2m
+    uv run benchmark.py --agents 2000 --interval 5m --mix sleep=80,cpu=20
+
+Lag and latency percentiles come from the scheduler's /metrics histograms, so
+they are bucket upper bounds (e.g. "p95 <= 2.5s").
+"""
+
+import argparse
+import os
+import random
+import re
+import resource
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from schedules import parse_duration
+
+AGENT_HEADER = """import asyncio
+import random
+import time
+
+from _channel import report_progress, report_result
+
+
+async def main():
+    report_progress("started")
+"""
+
+AGENT_FOOTER = """
+
+if __name__ == "__main__":
+    asyncio.run(main())
+"""
+
+AGENT_BODIES = {
+    "sleep": """    await asyncio.sleep(random.uniform(0.5, 2))
+    report_result(True, "slept")""",
+    "cpu": """    end = time.process_time() + 0.5
+    while time.process_time() < end:
+        pass
+    report_result(True, "computed")""",
+    "crash": """    raise RuntimeError("synthetic crash")""",
+    "hang": """    await asyncio.sleep(10**6)""",
+    "output": """    for i in range(20000):
+        print(f"line {i} " + "x" * 100)
+    report_result(True, "printed")""",
+}
+
+DEFAULT_MIX = "sleep=70,cpu=10,crash=5,hang=5,output=10"
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """Parse "sleep=70,cpu=10" into agent kind weights."""
+    mix = {}
+    for item in value.split(","):
+        kind, _, weight = item.partition("=")
+        kind = kind.strip()
+        if kind not in AGENT_BODIES:
+            raise ValueError(f"Unknown agent kind: {kind}")
+        mix[kind] = int(weight)
+    return mix
+
+
+def generate_agents(
+    scripts_dir: Path, count: int, mix: dict[str, int], seed: int
+) -> dict[str, int]:
+    """Write `count` synthetic agents and return how many of each kind."""
+    shutil.copy(Path(__file__).parent / "agents" / "_channel.py", scripts_dir)
+
+    rng = random.Random(seed)
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=count)
+    for index, kind in enumerate(kinds):
+        path = scripts_dir / f"agent_{index:05d}_{kind}.py"
+        path.write_text(AGENT_HEADER + AGENT_BODIES[kind] + AGENT_FOOTER)
+    return {kind: kinds.count(kind) for kind in mix}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def tree_rss_mb(root_pid: int) -> tuple[float, float] | None:
+    """(root RSS, RSS of root + all descendants) in MB, from /proc (Linux only)."""
+    rss: dict[int, float] = {}
+    children: dict[int, list[int]] = {}
+    try:
+        entries = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return None
+
+    for entry in entries:
+        pid = int(entry)
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                # The command name may contain spaces; fields after ")" are fixed
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        rss[pid] = int(line.split()[1]) / 1024
+                        break
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(pid)
+
+    if root_pid not in rss:
+        return None
+    total, stack = 0.0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0.0)
+        stack.extend(children.get(pid, []))
+    return rss[root_pid], total
+
+
+def parse_histogram(
+    text: str, name: str
+) -> tuple[list[tuple[float, float]], float, float]:
+    """
+    Sum a histogram over all label sets.
+
+    Returns:
+        tuple: ([(upper bound, cumulative count), ...], count, sum)
+    """
+    buckets: dict[float, float] = {}
+    count = total = 0.0
+    for line in text.splitlines():
+        if line.startswith(f"{name}_bucket"):
+            bound = re.search(r'le="([^"]+)"', line).group(1)
+            value = float(line.rsplit(" ", 1)[1])
+            key = float("inf") if bound == "+Inf" else float(bound)
+            buckets[key] = buckets.get(key, 0.0) + value
+        elif line.startswith(f"{name}_count"):
+            count += float(line.rsplit(" ", 1)[1])
+        elif line.startswith(f"{name}_sum"):
+            total += float(line.rsplit(" ", 1)[1])
+    return sorted(buckets.items()), count, total
+
+
+def histogram_summary(text: str, name: str) -> str:
+    """Mean and bucket-bound p50/p95/p99 of a histogram."""
+    buckets, count, total = parse_histogram(text, name)
+    if not count:
+        return "(no data)"
+
+    parts = [f"mean {total / count:.3f}s"]
+    for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        for bound, cumulative in buckets:
+            if cumulative >= fraction * count:
+                parts.append(f"{label} <= {bound:g}s")
+                break
+    return ", ".join(parts)
+
+
+def counter_by_label(text: str, name: str, label: str) -> dict[str, float]:
+    """Sum a counter per value of one label."""
+    totals: dict[str, float] = {}
+    for line in text.splitlines():
+        if line.startswith(f"{name}_total{{"):
+            value = re.search(rf'{label}="([^"]+)"', line).group(1)
+            totals[value] = totals.get(value, 0.0) + float(line.rsplit(" ", 1)[1])
+    return totals
+
+
+def run_benchmark(args: argparse.Namespace):
+    mix = parse_mix(args.mix)
+    duration = parse_duration(args.duration)
+    interval = parse_duration(args.interval)
+    work_dir = Path(tempfile.mkdtemp(prefix="scheduler-benchmark-"))
+    scripts_dir = work_dir / "agents"
+    scripts_dir.mkdir()
+
+    counts = generate_agents(scripts_dir, args.agents, mix, args.seed)
+    schedules = ";".join(
+        f"{path.name}={interval:g}s" for path in sorted(scripts_dir.glob("agent_*.py"))
+    )
+    port = free_port()
+
+    env = {
+        **os.environ,
+        "SCHEDULER_SCRIPTS_DIR": str(scripts_dir),
+        "SCHEDULER_AGENT_SCHEDULES": schedules,
+        "SCHEDULER_STAGGER_WINDOW": args.stagger,
+        "SCHEDULER_MAX_CONCURRENCY": str(args.concurrency),
+        "SCHEDULER_EXECUTION_MODE": args.mode,
+        "SCHEDULER_TIMEOUT": args.timeout,
+        "SCHEDULER_HISTORY_DB": str(work_dir / "history.db"),
+        "SCHEDULER_LOG_DIR": str(work_dir / "logs"),
+        "SCHEDULER_METRICS_HOST": "127.0.0.1",
+        "SCHEDULER_METRICS_PORT": str(port),
+        # Keep the load steady: no retries, no pausing of crashing agents
+        "SCHEDULER_RETRIES": "0",
+        "SCHEDULER_CIRCUIT_THRESHOLD": "0",
+        "SCHEDULER_CLUSTER_STORE": "",
+        "SCHEDULER_BROWSER_IDLE_TTL": "0",
+        # Synthetic agents don't need the heavy worker preloads
+        "SCHEDULER_WORKER_PRELOAD": "",
+    }
+
+    print(
+        f"Benchmark: {args.agents} agents "
+        f"({', '.join(f'{kind} {n}' for kind, n in counts.items())}), "
+        f"every {interval:g}s for {duration:g}s, mode {args.mode}, "
+        f"concurrency {args.concurrency}"
+    )
+    print(f"Working directory: {work_dir}")
+
+    log_path = work_dir / "scheduler.log"
+    with open(log_path, "w") as log:
+        started = time.monotonic()
+        process = subprocess.Popen(
+            [sys.executable, str(Path(__file__).parent / "main.py")],
+            cwd=Path(__file__).parent,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+        peak_rss = peak_tree_rss = 0.0
+        metrics_text = ""
+        scrape_error = None
+        try:
+            while time.monotonic() - started < duration:
+                if process.poll() is not None:
+                    raise RuntimeError(f"Scheduler exited early, see {log_path}")
+                sample = tree_rss_mb(process.pid)
+                if sample is not None:
+                    peak_rss = max(peak_rss, sample[0])
+                    peak_tree_rss = max(peak_tree_rss, sample[1])
+                time.sleep(0.5)
+
+            elapsed = time.monotonic() - started
+            try:
+                with urllib.request.urlopen(
+                    f"http://127.0.0.1:{port}/metrics", timeout=10
+                ) as response:
+                    metrics_text = response.read().decode()
+            except OSError as e:
+                # URLError, connection refused and timeouts are all OSErrors
+                scrape_error = str(getattr(e, "reason", e))
+        finally:
+            process.send_signal(signal.SIGINT)
+            try:
+                process.wait(timeout=60)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    # ru_maxrss of waited-for children: KB on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    max_rss_mb = max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+    peak_rss = max(peak_rss, max_rss_mb)
+
+    print()
+    if scrape_error is not None:
+        print(
+            f"Metrics:         unavailable, could not scrape /metrics ({scrape_error})"
+        )
+    else:
+        print_metrics(metrics_text, elapsed)
+    tree = f", process tree {peak_tree_rss:.0f} MB" if peak_tree_rss else ""
+    print(f"Peak RSS:        scheduler {peak_rss:.0f} MB{tree}")
+
+    if args.keep or scrape_error is not None:
+        print(f"\nKept {work_dir} (agents, logs, history.db, scheduler.log)")
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def print_metrics(metrics_text: str, elapsed: float):
+    """Print the run statistics scraped from the scheduler's /metrics."""
+    outcomes = counter_by_label(metrics_text, "scheduler_runs", "outcome")
+    finished = sum(outcomes.values())
+
+    print(
+        f"Runs finished:   {finished:.0f} (success {outcomes.get('success', 0):.0f}, "
+        f"failure {outcomes.get('failure', 0):.0f})"
+    )
+    print(f"Throughput:      {finished / elapsed:.2f} runs/s")
+    print(
+        "Schedule lag:    "
+        f"{histogram_summary(metrics_text, 'scheduler_schedule_lag_seconds')}"
+    )
+    print(
+        "Spawn latency:   "
+        f"{histogram_summary(metrics_text, 'scheduler_spawn_latency_seconds')}"
+    )
+    print(
+        "Run duration:    "
+        f"{histogram_summary(metrics_text, 'scheduler_run_duration_seconds')}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scheduler scale benchmark")
+    parser.add_argument("--agents", type=int, default=500, help="Number of agents")
+    parser.add_argument(
+        "--duration", default="2m", help="How long to run the scheduler (default: 2m)"
+    )
+    parser.add_argument(
+        "--interval", default="1m", help="Schedule of every agent (default: 1m)"
+    )
+    parser.add_argument(
+        "--stagger",
+        default="0",
+        help="SCHEDULER_STAGGER_WINDOW to spread starts over (default: 0)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="SCHEDULER_MAX_CONCURRENCY"
+    )
+    parser.add_argument(
+        "--mode",
+        default="subprocess",
+        choices=["subprocess", "inprocess", "worker"],
+        help="SCHEDULER_EXECUTION_MODE",
+    )
+    parser.add_argument(
+        "--timeout", default="15s", help="Run timeout, ends hanging agents"
+    )
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help=f"Agent kind weights (default: {DEFAULT_MIX})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the agent mix")
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the generated agents and logs"
+    )
+    run_benchmark(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
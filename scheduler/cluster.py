@@ -0,0 +1,213 @@
+"""
+Cluster mode: several schedulers sharing the agents through expiring leases.
+
+Every node heartbeats into a shared lease store. On each heartbeat a node
+renews the leases it holds, drops nodes (and their leases) that stopped
+heartbeating, and rebalances: it gives up leases above its fair share and
+claims unowned agents up to that share. The share is ceil(agents / live
+nodes), or floor(agents / live nodes) while another node holds fewer than
+that (e.g. one that just joined), so the nodes holding the extra agents hand
+them over. A node only schedules the agents it holds a lease for, so adding a
+node spreads the agents out and a dead node's agents are picked up once its
+leases expire.
+
+Leases alone can't prevent a double run while an agent changes owner (the old
+and new owner have different timers), so every run is also claimed in the
+store: a claim only succeeds if nobody started the same agent within half its
+schedule period, which gives exactly one run per agent per tick.
+
+Backends implement LeaseStore. The built-in SQLite backend relies on SQLite's
+file locking, so it works for nodes on one host or on a shared filesystem
+with reliable locks; other backends (Redis, Postgres, ...) can be registered
+in LEASE_STORES.
+"""
+
+import math
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    node TEXT PRIMARY KEY,
+    heartbeat_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    agent TEXT PRIMARY KEY,
+    node TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_claims (
+    agent TEXT PRIMARY KEY,
+    node TEXT NOT NULL,
+    claimed_at REAL NOT NULL
+);
+"""
+
+
+class LeaseStore(ABC):
+    """Interface of a shared lease store."""
+
+    @abstractmethod
+    def heartbeat(self, node: str, agents: list[str], ttl: float) -> set[str]:
+        """
+        Record that `node` is alive, rebalance and renew its leases.
+
+        Returns:
+            set[str]: The agents `node` holds a lease for until the next heartbeat
+        """
+
+    @abstractmethod
+    def claim_run(self, agent: str, node: str, min_spacing: float) -> bool:
+        """Claim the current tick of an agent; False if another node ran it."""
+
+    @abstractmethod
+    def leave(self, node: str):
+        """Release all leases of a node that is shutting down."""
+
+    def close(self):
+        pass
+
+
+class SQLiteLeaseStore(LeaseStore):
+    """Lease store in a SQLite database shared by all nodes."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self.connection = sqlite3.connect(path, timeout=10, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SQLITE_SCHEMA)
+
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, so the read-modify-write of
+        # a rebalance can't interleave with another node's
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def heartbeat(self, node: str, agents: list[str], ttl: float) -> set[str]:
+        now = time.time()
+        db = self._transaction()
+        try:
+            db.execute(
+                "INSERT INTO nodes (node, heartbeat_at) VALUES (?, ?) "
+                "ON CONFLICT (node) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+                (node, now),
+            )
+            db.execute("DELETE FROM nodes WHERE heartbeat_at < ?", (now - ttl,))
+            db.execute(
+                "DELETE FROM leases WHERE expires_at < ? "
+                "OR node NOT IN (SELECT node FROM nodes)",
+                (now,),
+            )
+
+            live_nodes = [other for (other,) in db.execute("SELECT node FROM nodes")]
+            floor_share = len(agents) // max(1, len(live_nodes))
+            counts = dict(db.execute("SELECT node, COUNT(*) FROM leases GROUP BY node"))
+            # A node below the floor (e.g. one that just joined) only gets
+            # agents if the nodes above it shed down to the floor
+            starving = any(
+                counts.get(other, 0) < floor_share
+                for other in live_nodes
+                if other != node
+            )
+            share = (
+                floor_share
+                if starving
+                else math.ceil(len(agents) / max(1, len(live_nodes)))
+            )
+
+            db.execute(
+                "UPDATE leases SET expires_at = ? WHERE node = ?", (now + ttl, node)
+            )
+            owned = [
+                agent
+                for (agent,) in db.execute(
+                    "SELECT agent FROM leases WHERE node = ? ORDER BY agent", (node,)
+                )
+            ]
+
+            # Give up leases above the fair share so new nodes get agents
+            for agent in owned[share:]:
+                db.execute(
+                    "DELETE FROM leases WHERE agent = ? AND node = ?", (agent, node)
+                )
+            owned = owned[:share]
+
+            leased = {agent for (agent,) in db.execute("SELECT agent FROM leases")}
+            for agent in sorted(set(agents) - leased):
+                if len(owned) >= share:
+                    break
+                db.execute(
+                    "INSERT INTO leases (agent, node, expires_at) VALUES (?, ?, ?)",
+                    (agent, node, now + ttl),
+                )
+                owned.append(agent)
+
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return set(owned)
+
+    def claim_run(self, agent: str, node: str, min_spacing: float) -> bool:
+        now = time.time()
+        db = self._transaction()
+        try:
+            # A lease that expired since the last heartbeat may be someone else's now
+            holds_lease = db.execute(
+                "SELECT 1 FROM leases WHERE agent = ? AND node = ? AND expires_at >= ?",
+                (agent, node, now),
+            ).fetchone()
+            if holds_lease is None:
+                db.execute("COMMIT")
+                return False
+
+            cursor = db.execute(
+                "INSERT INTO run_claims (agent, node, claimed_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (agent) DO UPDATE SET node = excluded.node, "
+                "claimed_at = excluded.claimed_at "
+                "WHERE run_claims.claimed_at <= ?",
+                (agent, node, now, now - min_spacing),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return cursor.rowcount == 1
+
+    def leave(self, node: str):
+        db = self._transaction()
+        try:
+            db.execute("DELETE FROM leases WHERE node = ?", (node,))
+            db.execute("DELETE FROM nodes WHERE node = ?", (node,))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        self.connection.close()
+
+
+# Lease store backends by URL scheme, e.g. "sqlite:///var/lib/scheduler/cluster.db"
+LEASE_STORES: dict[str, type[LeaseStore]] = {"sqlite": SQLiteLeaseStore}
+
+
+def open_lease_store(url: str, base_dir: Path) -> LeaseStore:
+    """
+    Open a lease store from a URL; a plain path means SQLite.
+
+    Relative SQLite paths are resolved against `base_dir`.
+    """
+    scheme, separator, location = url.partition("://")
+    if not separator:
+        scheme, location = "sqlite", url
+
+    store_class = LEASE_STORES.get(scheme)
+    if store_class is None:
+        raise ValueError(f"Unknown cluster store: {scheme}")
+    if store_class is SQLiteLeaseStore:
+        return SQLiteLeaseStore(base_dir / location)
+    return store_class(location)
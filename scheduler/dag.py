@@ -0,0 +1,174 @@
+"""
+Dependencies between scheduled agents.
+
+An agent that consumes another agent's output declares it with a module-level
+constant, e.g. DEPENDS_ON = ["gmail.py"]. Such a downstream agent has no
+schedule of its own: whenever one of its upstream agents finishes a run, the
+scheduler runs everything downstream of it in topological order, with
+independent branches in parallel. Each downstream agent starts the moment all
+of its inputs are ready and gets its upstream agents' results in-memory (see
+upstream_results() in agents/_channel.py).
+
+- An upstream agent outside the current run (e.g. the second input of a join
+  fed by another schedule) contributes its latest successful result.
+- If an input failed, was skipped, or has never succeeded, the downstream
+  agent and everything after it are skipped for this run.
+- Agents in a dependency cycle or depending on an unknown or disabled agent
+  never run; the problem is logged when the graph is built.
+"""
+
+import asyncio
+from graphlib import CycleError, TopologicalSorter
+from typing import Any, Awaitable, Callable
+
+
+class AgentGraph:
+    """Dependency graph of the discovered agents."""
+
+    def __init__(self, dependencies: dict[str, set[str]]):
+        self.dependencies = dependencies
+        self.dependents: dict[str, set[str]] = {name: set() for name in dependencies}
+        for name, upstream in dependencies.items():
+            for dependency in upstream:
+                if dependency in self.dependents:
+                    self.dependents[dependency].add(name)
+
+        # Why an agent can't run, for agents that never will
+        self.problems: dict[str, str] = {}
+        for name, upstream in dependencies.items():
+            missing = sorted(upstream - dependencies.keys())
+            if missing:
+                self.problems[name] = f"unknown dependency {', '.join(missing)}"
+        for cycle in find_cycles(dependencies):
+            for name in cycle:
+                self.problems[name] = f"dependency cycle {' -> '.join(cycle)}"
+        for name in list(self.problems):
+            for descendant in self.descendants(name):
+                self.problems.setdefault(descendant, f"depends on blocked {name}")
+
+    def is_root(self, name: str) -> bool:
+        """Whether an agent runs on its own schedule (no dependencies)."""
+        return not self.dependencies.get(name)
+
+    def descendants(self, name: str) -> set[str]:
+        """Every agent that directly or indirectly depends on `name`."""
+        found: set[str] = set()
+        stack = [name]
+        while stack:
+            for dependent in self.dependents.get(stack.pop(), ()):
+                if dependent not in found:
+                    found.add(dependent)
+                    stack.append(dependent)
+        return found
+
+
+def find_cycles(dependencies: dict[str, set[str]]) -> list[list[str]]:
+    """Find dependency cycles, one per call to graphlib until none is left."""
+    graph = {name: set(upstream) for name, upstream in dependencies.items()}
+    cycles = []
+    while True:
+        try:
+            TopologicalSorter(graph).prepare()
+            return cycles
+        except CycleError as e:
+            cycle = e.args[1]
+            cycles.append(cycle)
+            for name in cycle:
+                graph.pop(name, None)
+            for upstream in graph.values():
+                upstream.difference_update(cycle)
+
+
+def upstream_inputs(
+    graph: AgentGraph,
+    name: str,
+    results: dict[str, Any],
+    latest: dict[str, Any],
+) -> tuple[dict[str, Any] | None, str | None]:
+    """
+    Collect the results an agent depends on.
+
+    Returns:
+        tuple: (inputs, None) with the results by agent name, or (None, reason)
+        if an input is not available
+    """
+    inputs = {}
+    for dependency in sorted(graph.dependencies[name]):
+        if dependency in results:
+            result = results[dependency]
+            if result is None or not result.success:
+                return None, f"{dependency} did not succeed"
+        else:
+            result = latest.get(dependency)
+            if result is None:
+                return None, f"no result from {dependency} yet"
+        inputs[dependency] = result
+    return inputs, None
+
+
+async def run_graph(
+    graph: AgentGraph,
+    nodes: set[str],
+    run: Callable[[str, dict[str, Any]], Awaitable[Any]],
+    results: dict[str, Any] | None = None,
+    latest: dict[str, Any] | None = None,
+    on_skip: Callable[[str, str], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Run a set of agents in topological order, as parallel as possible.
+
+    `run(name, inputs)` starts one agent with its upstream results and
+    returns an object with a `success` attribute (or None if the run did not
+    happen). `results` holds results already known for this run (e.g. the
+    upstream agent that triggered it); `latest` holds the last successful
+    result of every agent and is updated as runs finish.
+
+    Returns:
+        dict: Result of every node by name (None for skipped nodes)
+    """
+    results = dict(results or {})
+    latest = latest if latest is not None else {}
+    # Blocked agents are skipped anyway; dropping their edges breaks cycles
+    sorter = TopologicalSorter(
+        {
+            name: set()
+            if name in graph.problems
+            else graph.dependencies.get(name, set()) & nodes
+            for name in nodes
+        }
+    )
+    sorter.prepare()
+    running: dict[asyncio.Task, str] = {}
+
+    try:
+        while sorter.is_active():
+            for name in sorter.get_ready():
+                reason = graph.problems.get(name)
+                inputs = None
+                if reason is None:
+                    inputs, reason = upstream_inputs(graph, name, results, latest)
+                if reason is not None:
+                    if on_skip is not None:
+                        on_skip(name, reason)
+                    results[name] = None
+                    sorter.done(name)
+                    continue
+                running[asyncio.create_task(run(name, inputs))] = name
+
+            if not running:
+                # Only skipped nodes this round; their dependents are ready now
+                continue
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                result = None if task.cancelled() else task.result()
+                results[name] = result
+                if result is not None and result.success:
+                    latest[name] = result
+                sorter.done(name)
+    finally:
+        for task in running:
+            task.cancel()
+
+    return results
@@ -0,0 +1,100 @@
+"""
+Run history for the scheduler, stored in an embedded SQLite database.
+
+Every finished run is recorded with its agent, start time, duration, exit
+code, result size and success flag. The table is indexed by start time (and
+by agent + start time) so per-agent statistics over a time window stay fast
+as the history grows; `uv run main.py --stats` prints them.
+"""
+
+import math
+import sqlite3
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    exit_code INTEGER,
+    result_size INTEGER NOT NULL,
+    success INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs (started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_agent_started_at ON runs (agent, started_at);
+"""
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class RunHistory:
+    """Persistent store of scheduler runs."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        # WAL lets --stats read while the scheduler is writing
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def record(
+        self,
+        agent: str,
+        started_at: float,
+        duration: float,
+        exit_code: int | None,
+        result_size: int,
+        success: bool,
+    ):
+        """Store one finished run."""
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO runs (agent, started_at, duration, exit_code, "
+                "result_size, success) VALUES (?, ?, ?, ?, ?, ?)",
+                (agent, started_at, duration, exit_code, result_size, int(success)),
+            )
+
+    def stats(self, window_seconds: float) -> list[dict]:
+        """
+        Per-agent statistics for runs started within the last `window_seconds`.
+
+        Returns:
+            list[dict]: One entry per agent with run count, success rate and
+            p50/p95/p99 duration, sorted by agent name
+        """
+        since = time.time() - window_seconds
+        rows = self.connection.execute(
+            "SELECT agent, duration, success FROM runs WHERE started_at >= ? "
+            "ORDER BY agent, duration",
+            (since,),
+        ).fetchall()
+
+        per_agent: dict[str, list[tuple[float, int]]] = {}
+        for agent, duration, success in rows:
+            per_agent.setdefault(agent, []).append((duration, success))
+
+        stats = []
+        for agent, runs in per_agent.items():
+            durations = [duration for duration, _ in runs]
+            stats.append(
+                {
+                    "agent": agent,
+                    "runs": len(runs),
+                    "success_rate": sum(success for _, success in runs) / len(runs),
+                    "p50": percentile(durations, 0.50),
+                    "p95": percentile(durations, 0.95),
+                    "p99": percentile(durations, 0.99),
+                }
+            )
+        return stats
+
+    def close(self):
+        self.connection.close()
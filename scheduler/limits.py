@@ -0,0 +1,205 @@
+"""
+Global rate and budget limits shared by all agents of a scheduler.
+
+Concurrent agents all draw on the same Browser Use Cloud and LLM quotas. The
+scheduler owns one token bucket per resource and agents ask it for a token
+before they use the resource, so a burst of runs is smoothed into a queue
+instead of a storm of 429 responses:
+- "sandbox": cloud browser sandboxes created per minute
+- "llm": LLM calls per minute
+
+An optional daily cost budget (in USD, reset at local midnight) is checked
+before a sandbox is granted; once it is spent, runs fail fast instead of
+spending more. Agents report what a run cost after the fact.
+
+Agents reach the limiter over a Unix socket whose path the scheduler puts in
+SCHEDULER_LIMITER_SOCKET (see agents/_limits.py). The protocol is one JSON
+request and one JSON reply per line:
+- {"acquire": "sandbox", "amount": 1} -> {"granted": true, "waited": 0.4}
+  or {"granted": false, "reason": "..."}; the reply is delayed until a token
+  is available
+- {"spend": 0.12} -> {"spent_today": 3.45}
+
+The limits apply per scheduler process; in cluster mode each node has its own.
+"""
+
+import asyncio
+import json
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+
+class TokenBucket:
+    """Token bucket refilled at a fixed rate; waiters are served in order."""
+
+    def __init__(self, rate_per_minute: float, burst: float | None = None):
+        self.rate = rate_per_minute / 60
+        # Default burst: ten seconds' worth of tokens, at least one
+        self.capacity = burst or max(1.0, rate_per_minute / 6)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        # Requests waiting for a token right now
+        self.waiting = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Take `amount` tokens, waiting until they are available.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            # The lock is FIFO, so one waiter at a time sleeps for the refill
+            async with self._lock:
+                self._refill()
+                if self.tokens < amount:
+                    await asyncio.sleep((amount - self.tokens) / self.rate)
+                    self._refill()
+                self.tokens -= amount
+        finally:
+            self.waiting -= 1
+        return time.monotonic() - started
+
+
+class DailyBudget:
+    """Spending limit that resets at local midnight."""
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.day = date.today()
+        self.spent = 0.0
+
+    def _roll(self):
+        if date.today() != self.day:
+            self.day = date.today()
+            self.spent = 0.0
+
+    def spend(self, amount: float) -> float:
+        """Record spending and return the total spent today."""
+        self._roll()
+        self.spent += amount
+        return self.spent
+
+    def exhausted(self) -> bool:
+        self._roll()
+        return self.spent >= self.limit
+
+
+class Limiter:
+    """The scheduler's rate limits and budget, served to agents over a socket."""
+
+    def __init__(
+        self,
+        sandbox_per_minute: float = 0,
+        llm_per_minute: float = 0,
+        daily_budget: float = 0,
+    ):
+        self.buckets: dict[str, TokenBucket] = {}
+        if sandbox_per_minute > 0:
+            self.buckets["sandbox"] = TokenBucket(sandbox_per_minute)
+        if llm_per_minute > 0:
+            self.buckets["llm"] = TokenBucket(llm_per_minute)
+        self.budget = DailyBudget(daily_budget) if daily_budget > 0 else None
+        self.socket_path: Path | None = None
+        self._server: asyncio.Server | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.buckets or self.budget)
+
+    @property
+    def waiting(self) -> int:
+        """Requests waiting for a token, over all resources."""
+        return sum(bucket.waiting for bucket in self.buckets.values())
+
+    @property
+    def spent_today(self) -> float:
+        return self.spend(0)
+
+    def spend(self, amount: float) -> float:
+        """Record what a run cost and return the total spent today."""
+        return self.budget.spend(amount) if self.budget is not None else 0.0
+
+    def budget_exhausted(self) -> str | None:
+        """Describe the spent budget, or None if there is budget left."""
+        if self.budget is not None and self.budget.exhausted():
+            return (
+                f"daily budget of ${self.budget.limit:.2f} spent "
+                f"(${self.budget.spent:.2f} today)"
+            )
+        return None
+
+    async def acquire(self, resource: str, amount: float = 1.0) -> dict:
+        """Handle an acquire request; unknown resources are not limited."""
+        bucket = self.buckets.get(resource)
+        waited = await bucket.acquire(amount) if bucket is not None else 0.0
+        # Checked after the wait: the runs ahead in the queue may have spent it
+        if resource == "sandbox":
+            reason = self.budget_exhausted()
+            if reason is not None:
+                return {"granted": False, "reason": reason}
+        return {"granted": True, "waited": waited}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            async for line in reader:
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    request = None
+                if not isinstance(request, dict):
+                    reply = {"error": "malformed request"}
+                elif "acquire" in request:
+                    try:
+                        amount = float(request.get("amount", 1))
+                    except (TypeError, ValueError):
+                        reply = {"error": "amount must be a number"}
+                    else:
+                        reply = await self.acquire(str(request["acquire"]), amount)
+                elif "spend" in request:
+                    try:
+                        reply = {"spent_today": self.spend(float(request["spend"]))}
+                    except (TypeError, ValueError):
+                        reply = {"error": "spend must be a number"}
+                else:
+                    reply = {"error": "unknown request"}
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            # The agent exited (or was killed) while waiting for its token
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self) -> Path:
+        """Listen on a private Unix socket and return its path."""
+        directory = Path(tempfile.mkdtemp(prefix="scheduler-limits-"))
+        self.socket_path = directory / "limiter.sock"
+        self._server = await asyncio.start_unix_server(
+            self._handle, path=str(self.socket_path)
+        )
+        return self.socket_path
+
+    async def close(self):
+        """Stop serving and remove the socket."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.socket_path is not None:
+            try:
+                self.socket_path.unlink(missing_ok=True)
+                self.socket_path.parent.rmdir()
+            except OSError:
+                pass
+            self.socket_path = None
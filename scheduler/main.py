@@ -2,26 +2,120 @@
 Scheduler that executes browser-use agents every N minutes.
 
 This script automatically discovers and runs all Python scripts in the agents
-directory as concurrent subprocesses on a configurable interval, logging each
-execution with timestamps and displaying final results.
+directory as concurrent subprocesses, each on its own interval or cron
+schedule, logging each execution with timestamps and displaying final results.
 
 Configuration:
-- SCHEDULER_INTERVAL_MINUTES: Time between executions (default: 5)
+- SCHEDULER_INTERVAL_MINUTES: Default time between runs of each agent (default: 5)
+- SCHEDULER_AGENT_SCHEDULES: Per-agent cadence as an interval or a cron
+  expression, separated by ";", e.g. "x.py=15m;gmail.py=*/5 * * * *"
 - SCHEDULER_SCRIPTS_DIR: Directory containing the scripts (default: agents)
+- SCHEDULER_STAGGER_WINDOW: Spread agent starts over this window, e.g. "60s",
+  with a fixed per-agent offset so they don't all create sandboxes at once
+  (default: 0 = off; capped at the agent's interval)
+- SCHEDULER_RELOAD_SECONDS: How often the scripts directory is rescanned so
+  agents can be added, disabled or edited without a restart (default: 10, 0 = off)
+- SCHEDULER_MAX_CONCURRENCY: Maximum number of agents running at once (default: 4)
+- SCHEDULER_MAX_LOAD, SCHEDULER_MIN_AVAILABLE_MB, SCHEDULER_MAX_PROCESSES:
+  Admission limits - a run only starts while the 1-minute load average per
+  CPU, available memory and host process count are within them (default: 0 =
+  no limit); SCHEDULER_ADMISSION_POLL sets how often they are re-checked (default: 2s)
+- SCHEDULER_AGENT_PRIORITIES: Per-agent priorities, e.g. "gmail.py=10,x.py=0"
+  (higher runs first, default: 0)
+- SCHEDULER_CONCURRENCY_LIMITS: Maximum concurrent runs per concurrency class,
+  e.g. "browser=2,llm=4"; agents join a class with "concurrency" in their
+  SCHEDULER metadata (default: no class limits)
+- SCHEDULER_EXECUTION_MODE: "subprocess" (default) starts a fresh interpreter
+  per run; "inprocess" imports each agent once and awaits its main()/run()
+  coroutine inside the scheduler (agents opt out with SCHEDULER_IN_PROCESS = False);
+  "worker" runs scripts on pre-warmed, long-lived worker processes
+- SCHEDULER_TIMEOUT: Default run timeout, e.g. "30m" (default: 60m); the whole
+  process tree of a run that exceeds it is killed
+- SCHEDULER_AGENT_TIMEOUTS: Per-agent timeouts, e.g. "x.py=10m,gmail.py=5m"
+- SCHEDULER_OVERLAP_POLICY: What to do when an agent is due while its previous
+  run is still in flight: "skip" (default), "queue" or "cancel"
+- SCHEDULER_AGENT_OVERLAP: Per-agent overlap policies, e.g. "x.py=cancel"
+- SCHEDULER_RETRIES: How often a failed run is retried within the same tick
+  (default: 0); SCHEDULER_AGENT_RETRIES sets it per agent, e.g. "x.py=2"
+- SCHEDULER_RETRY_BACKOFF: Base retry delay, doubled per attempt with full
+  jitter (default: 10s); capped at SCHEDULER_RETRY_MAX_BACKOFF (default: 5m)
+- SCHEDULER_CIRCUIT_THRESHOLD: Consecutive failures after which an agent is
+  paused (default: 5, 0 = off); after SCHEDULER_CIRCUIT_COOLDOWN (default: 30m)
+  one probe run decides whether it is resumed
+- SCHEDULER_CLUSTER_STORE: Shared lease store that turns on cluster mode, e.g.
+  "sqlite:////shared/cluster.db" (default: disabled); every node running
+  against the same store schedules only the agents it holds a lease for
+- SCHEDULER_NODE_ID: Name of this node in the cluster (default: hostname-pid)
+- SCHEDULER_LEASE_TTL: Lease lifetime; a node that stops heartbeating loses its
+  agents after this long (default: 30s)
+- SCHEDULER_HISTORY_DB: SQLite file every run is recorded in
+  (default: scheduler_history.db, empty to disable); see --stats
+- SCHEDULER_LOG_DIR: Directory for rotating per-agent output logs (default: logs,
+  empty to disable); SCHEDULER_LOG_MAX_MB caps each file (default: 5) and
+  SCHEDULER_LOG_BACKUPS sets how many rotated files are kept (default: 3)
+- SCHEDULER_OUTPUT_TAIL_LINES: Output lines attached to failed runs (default: 50)
+- SCHEDULER_METRICS_PORT: Serve OpenMetrics on http://HOST:PORT/metrics
+  (default: disabled); SCHEDULER_METRICS_HOST sets the bind address (default: 127.0.0.1)
+- SCHEDULER_BROWSER_IDLE_TTL: Keep a warm cloud browser per profile between
+  runs of agents that set KEEP_BROWSER_WARM = True, stopping it after this long
+  unused (default: 0 = off); uses CLOUD_PROFILE_ID, CLOUD_PROXY_COUNTRY_CODE
+  and CLOUD_TIMEOUT
+- SCHEDULER_SANDBOX_RATE, SCHEDULER_LLM_RATE: Cloud sandboxes created and LLM
+  calls made per minute by all agents together (default: 0 = no limit); agents
+  ask the scheduler for a token first and queue instead of running into 429s
+- SCHEDULER_DAILY_BUDGET: Daily cost budget in USD; once the cost agents
+  report reaches it, runs fail fast until midnight (default: 0 = no budget)
+- SCHEDULER_WORKER_MAX_JOBS: Jobs before a worker is recycled (default: 20)
+- SCHEDULER_WORKER_MAX_MEMORY_MB: Worker memory ceiling before recycling (default: 1024)
 - All other configuration is inherited from .env (API keys, profiles, etc.)
 
 Auto-discovery:
 - All .py files in the scripts directory are automatically discovered and run
 - Files starting with _ or . are ignored (use to disable scripts)
+- Changes to the directory are picked up while the scheduler is running
+
+Per-agent metadata:
+- Agents tune their own schedule, timeout, priority, retries, overlap policy,
+  concurrency class and dependencies with a module-level SCHEDULER dict, read by
+  static parsing (see metadata.py); the per-agent variables above override it
+
+Dependencies:
+- An agent that sets DEPENDS_ON = ["gmail.py"] has no schedule of its own; it
+  runs right after its upstream agents, with their results passed in-memory
+  (see dag.py and upstream_results() in agents/_channel.py)
 """
 
+import argparse
 import asyncio
+import heapq
+import importlib.util
+import inspect
+import itertools
+import json
 import os
+import socket
 import sys
+import time
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from types import ModuleType
 from dotenv import load_dotenv
 
+from admission import AdmissionController
+from cluster import LeaseStore, open_lease_store
+from dag import AgentGraph, run_graph
+from history import RunHistory
+from limits import Limiter
+from metadata import load_metadata, prune_metadata
+from metrics import SchedulerMetrics
+from retry import CircuitBreaker, RetryPolicy
+from run_output import RunOutput, agent_logger
+from sessions import BrowserSession, BrowserSessionPool
+from schedules import parse_duration, parse_schedule, stagger_offset
+from worker import CHANNEL_LINE_LIMIT, WorkerProcess, kill_process_tree
+
 # Load environment variables
 load_dotenv()
 
@@ -33,93 +127,1188 @@ INTERVAL_SECONDS = INTERVAL_MINUTES * 60
 SCRIPTS_DIR = os.getenv("SCHEDULER_SCRIPTS_DIR", "agents")
 
 
+def parse_agent_map(value: str, separator: str = ",") -> dict[str, str]:
+    """Parse a "script.py=value,other.py=value" setting into a dict."""
+    mapping = {}
+    for item in value.split(separator):
+        if "=" not in item:
+            continue
+        name, _, setting = item.partition("=")
+        mapping[name.strip()] = setting.strip()
+    return mapping
+
+
+# Window agent starts are spread over (deterministic per-agent offsets)
+STAGGER_WINDOW = parse_duration(os.getenv("SCHEDULER_STAGGER_WINDOW", "0"))
+
+# How often the scripts directory is rescanned for added/removed/edited agents
+# (0 disables hot reload)
+RELOAD_SECONDS = float(os.getenv("SCHEDULER_RELOAD_SECONDS", 10))
+
+# Longest sleep of the scheduler loop when nothing is due, e.g. every agent
+# only runs after another one and hot reload is off
+IDLE_SLEEP_SECONDS = 60
+
+# Worker pool
+MAX_CONCURRENCY = max(1, int(os.getenv("SCHEDULER_MAX_CONCURRENCY", 4)))
+AGENT_PRIORITIES = {
+    name: int(priority)
+    for name, priority in parse_agent_map(
+        os.getenv("SCHEDULER_AGENT_PRIORITIES", "")
+    ).items()
+}
+CONCURRENCY_LIMITS = {
+    name: int(limit)
+    for name, limit in parse_agent_map(
+        os.getenv("SCHEDULER_CONCURRENCY_LIMITS", "")
+    ).items()
+}
+
+# Admission control: runs wait in the queue while the host is over a limit
+ADMISSION = AdmissionController(
+    max_load=float(os.getenv("SCHEDULER_MAX_LOAD", 0)),
+    min_available_mb=float(os.getenv("SCHEDULER_MIN_AVAILABLE_MB", 0)),
+    max_processes=int(os.getenv("SCHEDULER_MAX_PROCESSES", 0)),
+    poll_interval=parse_duration(os.getenv("SCHEDULER_ADMISSION_POLL", "2s")),
+)
+
+# Per-agent schedules (";"-separated because cron expressions contain commas)
+AGENT_SCHEDULES = parse_agent_map(os.getenv("SCHEDULER_AGENT_SCHEDULES", ""), ";")
+
+# Per-agent run timeouts (SCHEDULER_TIMEOUT applies to agents without an entry)
+DEFAULT_TIMEOUT = parse_duration(os.getenv("SCHEDULER_TIMEOUT", "60m"))
+AGENT_TIMEOUTS = parse_agent_map(os.getenv("SCHEDULER_AGENT_TIMEOUTS", ""))
+
+# What to do when an agent is due while its previous run is still in flight:
+# "skip" the new run, "queue" it to start right after, or "cancel" the old run
+OVERLAP_POLICIES = ("skip", "queue", "cancel")
+DEFAULT_OVERLAP = os.getenv("SCHEDULER_OVERLAP_POLICY", "skip").lower()
+AGENT_OVERLAP = parse_agent_map(os.getenv("SCHEDULER_AGENT_OVERLAP", ""))
+
+# Retries within a tick (exponential backoff with full jitter)
+DEFAULT_RETRIES = int(os.getenv("SCHEDULER_RETRIES", 0))
+AGENT_RETRIES = parse_agent_map(os.getenv("SCHEDULER_AGENT_RETRIES", ""))
+RETRY_POLICY = RetryPolicy(
+    parse_duration(os.getenv("SCHEDULER_RETRY_BACKOFF", "10s")),
+    parse_duration(os.getenv("SCHEDULER_RETRY_MAX_BACKOFF", "5m")),
+)
+
+# Circuit breaker: pause an agent after this many consecutive failures
+CIRCUIT_THRESHOLD = int(os.getenv("SCHEDULER_CIRCUIT_THRESHOLD", 5))
+CIRCUIT_COOLDOWN = parse_duration(os.getenv("SCHEDULER_CIRCUIT_COOLDOWN", "30m"))
+
+# Cluster mode (disabled unless a lease store is configured)
+CLUSTER_STORE = os.getenv("SCHEDULER_CLUSTER_STORE", "")
+NODE_ID = os.getenv("SCHEDULER_NODE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+LEASE_TTL = parse_duration(os.getenv("SCHEDULER_LEASE_TTL", "30s"))
+
+# SQLite run history (relative paths are inside the scheduler directory)
+HISTORY_DB = os.getenv("SCHEDULER_HISTORY_DB", "scheduler_history.db")
+
+# Agent stdout/stderr: rotating per-agent log files (relative paths are inside
+# the scheduler directory, empty disables) and the tail attached to failures
+LOG_DIR = os.getenv("SCHEDULER_LOG_DIR", "logs")
+LOG_MAX_BYTES = int(float(os.getenv("SCHEDULER_LOG_MAX_MB", 5)) * 1024 * 1024)
+LOG_BACKUPS = int(os.getenv("SCHEDULER_LOG_BACKUPS", 3))
+OUTPUT_TAIL_LINES = int(os.getenv("SCHEDULER_OUTPUT_TAIL_LINES", 50))
+
+# OpenMetrics endpoint (disabled unless a port is set)
+METRICS_PORT = int(os.getenv("SCHEDULER_METRICS_PORT", 0))
+METRICS_HOST = os.getenv("SCHEDULER_METRICS_HOST", "127.0.0.1")
+
+# How agents are executed: "subprocess", "inprocess" or "worker"
+EXECUTION_MODE = os.getenv("SCHEDULER_EXECUTION_MODE", "subprocess").lower()
+
+# Warm cloud browser sessions kept between runs (0 disables)
+BROWSER_IDLE_TTL = parse_duration(os.getenv("SCHEDULER_BROWSER_IDLE_TTL", "0"))
+
+# Rate limits and daily budget shared by all agents (0 disables each)
+LIMITER = Limiter(
+    sandbox_per_minute=float(os.getenv("SCHEDULER_SANDBOX_RATE", 0)),
+    llm_per_minute=float(os.getenv("SCHEDULER_LLM_RATE", 0)),
+    daily_budget=float(os.getenv("SCHEDULER_DAILY_BUDGET", 0)),
+)
+
+# Pre-warmed worker processes ("worker" execution mode)
+WORKER_MAX_JOBS = int(os.getenv("SCHEDULER_WORKER_MAX_JOBS", 20))
+WORKER_MAX_MEMORY_MB = int(os.getenv("SCHEDULER_WORKER_MAX_MEMORY_MB", 1024))
+
+
 def log_message(message: str, level: str = "INFO"):
     """Log a message with timestamp."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     print(f"[{timestamp}] [{level}] {message}", flush=True)
 
 
-async def run_script_subprocess(script_path: Path) -> tuple[str, bool, str]:
+def agent_setting(script: Path, key: str, overrides: dict, default=None):
     """
-    Run a Python script as a subprocess and read its result from a JSON file.
-
-    Returns:
-        tuple: (script_name, success, result_content)
+    A per-agent setting: the SCHEDULER_AGENT_* override from the environment,
+    else the agent's own SCHEDULER metadata (see metadata.py), else `default`.
     """
-    import json
+    value = overrides.get(script.name)
+    if value is None or value == "":
+        value = load_metadata(script).get(key)
+    return default if value is None else value
+
+
+def get_timeout(script: Path) -> float:
+    """Return the run timeout in seconds for a script."""
+    value = agent_setting(script, "timeout", AGENT_TIMEOUTS)
+    if value is not None:
+        try:
+            return parse_duration(str(value))
+        except (TypeError, ValueError):
+            log_message(f"Invalid timeout for {script.name}: {value}", "ERROR")
+    return DEFAULT_TIMEOUT
+
+
+def get_overlap_policy(script: Path) -> str:
+    """Return the overlap policy ("skip", "queue" or "cancel") for a script."""
+    policy = str(agent_setting(script, "overlap", AGENT_OVERLAP, DEFAULT_OVERLAP))
+    policy = policy.lower()
+    if policy not in OVERLAP_POLICIES:
+        log_message(f"Unknown overlap policy for {script.name}: {policy}", "ERROR")
+        return "skip"
+    return policy
+
+
+def get_retries(script: Path) -> int:
+    """Return how often a failed run of a script is retried."""
+    value = agent_setting(script, "retries", AGENT_RETRIES)
+    if value is not None:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            log_message(f"Invalid retry count for {script.name}: {value}", "ERROR")
+    return DEFAULT_RETRIES
+
+
+def get_priority(script: Path) -> int:
+    """Return the queue priority of a script (higher runs first)."""
+    value = agent_setting(script, "priority", AGENT_PRIORITIES, 0)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        log_message(f"Invalid priority for {script.name}: {value}", "ERROR")
+        return 0
 
-    script_name = script_path.name
-    log_message(f"Starting {script_name}...", "INFO")
 
-    # Define where the script will write its result
-    result_file = Path("/tmp") / f"{script_name}_result.json"
+def get_concurrency_class(script: Path) -> str | None:
+    """Return the concurrency class a script belongs to, if any."""
+    value = load_metadata(script).get("concurrency")
+    return None if value is None else str(value)
 
-    # Clean up any existing result file
-    if result_file.exists():
-        result_file.unlink()
 
-    try:
-        # Run the script as a subprocess (output goes to /dev/null, we read the file)
-        process = await asyncio.create_subprocess_exec(
-            sys.executable,
-            str(script_path),
-            stdout=asyncio.subprocess.DEVNULL,
-            stderr=asyncio.subprocess.DEVNULL,
-            cwd=script_path.parent,
+def open_run_output(script_name: str) -> RunOutput:
+    """Create the output capture (ring buffer + log file) for one run."""
+    logger = None
+    if LOG_DIR:
+        logger = agent_logger(
+            Path(__file__).parent / LOG_DIR, script_name, LOG_MAX_BYTES, LOG_BACKUPS
         )
+    return RunOutput(script_name, OUTPUT_TAIL_LINES, logger)
+
+
+@dataclass
+class RunResult:
+    """Outcome of a single agent run."""
+
+    script_name: str
+    success: bool
+    output: str
+    wait_seconds: float = 0.0
+    admission_seconds: float = 0.0
+    startup_seconds: float = 0.0
+    duration_seconds: float = 0.0
+    started_at: float = 0.0
+    exit_code: int | None = None
+    attempts: int = 1
+    # Measurements the agent reported with its result (see agents/_runtime.py)
+    agent_metrics: dict = field(default_factory=dict)
 
-        # Wait for completion
-        returncode = await process.wait()
 
-        # Read the result from the JSON file
-        if result_file.exists():
-            with open(result_file, "r") as f:
-                result_data = json.load(f)
+class RunChannel:
+    """
+    Per-run result channel: collects the JSON-line messages an agent reports.
+
+    Agents report progress, partial results and their final result with the
+    helpers in agents/_channel.py (which also documents the message schema).
+    Every run gets its own pipe and SCHEDULER_RUN_ID, so overlapping runs or
+    several schedulers never read each other's results.
+    """
 
-            success = result_data.get("success", False)
-            result_content = result_data.get("result", "No result")
+    def __init__(self, script_name: str, run_id: str, output: RunOutput | None = None):
+        self.script_name = script_name
+        self.run_id = run_id
+        # Captured stdout/stderr; its tail is attached to failed runs
+        self.output = output
+        if output is not None:
+            output.start(run_id)
+        self.dispatched_at = time.monotonic()
+        self.first_message_at: float | None = None
+        self.partial = None
+        self.final: dict | None = None
+
+    def env(self) -> dict[str, str]:
+        """Environment variables identifying this run to the agent."""
+        return {"SCHEDULER_RUN_ID": self.run_id, "SCHEDULER_SCRIPT": self.script_name}
+
+    @property
+    def startup_seconds(self) -> float:
+        """Time from dispatch until the agent reported its first message."""
+        if self.first_message_at is None:
+            return 0.0
+        return self.first_message_at - self.dispatched_at
+
+    def handle(self, message: dict):
+        """Process one message reported by the agent."""
+        if message.get("run_id") not in (None, self.run_id):
+            log_message(
+                f"{self.script_name}: ignoring message for run {message.get('run_id')}",
+                "WARNING",
+            )
+            return
+
+        if self.first_message_at is None:
+            self.first_message_at = time.monotonic()
+
+        message_type = message.get("type")
+        if message_type == "progress":
+            log_message(f"{self.script_name}: {message.get('message')}")
+        elif message_type == "partial":
+            self.partial = message.get("result")
+            log_message(f"{self.script_name}: partial result received")
+        elif message_type == "result":
+            self.final = message
+
+    def handle_line(self, line: bytes):
+        """Decode and process one JSON line from the channel pipe."""
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            log_message(f"{self.script_name}: malformed channel message", "WARNING")
+            return
+        self.handle(message)
+
+    async def read(self, reader: asyncio.StreamReader):
+        """Process messages from a channel pipe until it is closed."""
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # Longer than CHANNEL_LINE_LIMIT; the reader skipped past it
+                log_message(f"{self.script_name}: channel message too large", "WARNING")
+                continue
+            if not line:
+                return
+            self.handle_line(line)
+
+    def run_result(self, returncode: int | None = None) -> RunResult:
+        """Build the RunResult once the agent has finished."""
+        script_name = self.script_name
+
+        if self.final is not None:
+            success = bool(self.final.get("success", False))
+            result_content = self.final.get("result", "No result")
 
             if success:
                 log_message(f"{script_name} completed successfully", "SUCCESS")
             else:
                 log_message(f"{script_name} completed with no result", "WARNING")
+                result_content = self.with_output_tail(result_content)
+
+            return RunResult(
+                script_name,
+                success,
+                result_content,
+                startup_seconds=self.startup_seconds,
+                exit_code=returncode,
+                agent_metrics=self.final.get("metrics") or {},
+            )
+
+        # No final result - script failed or didn't report one
+        log_message(
+            f"{script_name} failed - no result reported (exit code: {returncode})",
+            "ERROR",
+        )
+        output = f"Script exited with code {returncode}, no result reported"
+        if self.partial is not None:
+            output += f"\n\nLast partial result:\n{self.partial}"
+        return RunResult(
+            script_name,
+            False,
+            self.with_output_tail(output),
+            startup_seconds=self.startup_seconds,
+            exit_code=returncode,
+        )
+
+    def with_output_tail(self, text) -> str:
+        """Append the tail of the captured output to a failure message."""
+        tail = self.output.tail() if self.output is not None else ""
+        if not tail:
+            return text
+        return f"{text}\n\n{tail}"
+
+
+async def open_channel_pipe() -> tuple[int, asyncio.StreamReader]:
+    """Create a pipe for a run's channel and return (write_fd, reader)."""
+    read_fd, write_fd = os.pipe()
+    reader = asyncio.StreamReader(limit=CHANNEL_LINE_LIMIT)
+    await asyncio.get_running_loop().connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(read_fd, "rb")
+    )
+    return write_fd, reader
+
+
+def execution_failed(script_name: str, error: Exception) -> RunResult:
+    """Log an unexpected execution error and turn it into a failed RunResult."""
+    log_message(f"{script_name} execution failed: {str(error)}", "ERROR")
+    import traceback
+
+    error_trace = traceback.format_exc()
+    log_message(error_trace, "ERROR")
+    return RunResult(script_name, False, str(error))
+
+
+# Upstream results travel in one environment variable; keep it well below the
+# kernel's per-variable limit (128 KB) for subprocess runs
+UPSTREAM_MAX_BYTES = 64 * 1024
+
+
+def upstream_env(upstream: dict[str, str] | None) -> dict[str, str]:
+    """Environment variable carrying upstream results to a dependent agent."""
+    if not upstream:
+        return {}
+
+    budget = UPSTREAM_MAX_BYTES // len(upstream)
+    results = {}
+    for name, text in upstream.items():
+        encoded = text.encode()
+        if len(encoded) > budget:
+            log_message(
+                f"Result of {name} truncated to {budget} bytes for its dependents",
+                "WARNING",
+            )
+            text = encoded[:budget].decode(errors="ignore")
+        results[name] = text
+    return {"SCHEDULER_UPSTREAM_RESULTS": json.dumps(results, ensure_ascii=False)}
+
+
+async def run_script_subprocess(
+    script_path: Path,
+    output: RunOutput | None = None,
+    env: dict[str, str] | None = None,
+) -> RunResult:
+    """
+    Run a Python script as a subprocess and read its result from its channel.
+
+    stdout and stderr are streamed into `output` (ring buffer + log file)
+    while the script runs, so the pipe never fills up and blocks the agent.
+
+    Returns:
+        RunResult: Outcome of the run (startup_seconds is the time until the
+        agent reported its first message, i.e. interpreter start and imports)
+    """
+    script_name = script_path.name
+    log_message(f"Starting {script_name}...", "INFO")
+
+    output = output or open_run_output(script_name)
+    channel = RunChannel(script_name, uuid.uuid4().hex, output)
+
+    try:
+        write_fd, reader = await open_channel_pipe()
+        try:
+            # Run the script as a subprocess (stdout and stderr are captured
+            # together, results come back over the channel pipe)
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                str(script_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                cwd=script_path.parent,
+                start_new_session=True,
+                env={
+                    **os.environ,
+                    **channel.env(),
+                    **(env or {}),
+                    "SCHEDULER_RESULT_FD": str(write_fd),
+                },
+                pass_fds=(write_fd,),
+            )
+        finally:
+            # Only the child holds the write end, so EOF means it is done
+            os.close(write_fd)
+
+        readers = [
+            asyncio.create_task(channel.read(reader)),
+            asyncio.create_task(output.read(process.stdout)),
+        ]
+
+        # Wait for completion; on timeout or cancellation kill the whole
+        # process tree (the agent and any browser it started)
+        try:
+            returncode = await process.wait()
+        except asyncio.CancelledError:
+            await kill_process_tree(process)
+            for task in readers:
+                task.cancel()
+            raise
+
+        # A grandchild could inherit the pipes; don't wait on them forever
+        await asyncio.wait(readers, timeout=5)
+        for task in readers:
+            task.cancel()
+
+        return channel.run_result(returncode)
+
+    except Exception as e:
+        return execution_failed(script_name, e)
+
+
+# Agent modules imported by the in-process mode, keyed by script path
+_agent_modules: dict[Path, ModuleType] = {}
+
+
+def forget_agent_module(script_name: str):
+    """Drop a cached in-process agent module so the next run re-imports it."""
+    for script_path in list(_agent_modules):
+        if script_path.name == script_name:
+            del _agent_modules[script_path]
 
-            return (script_name, success, result_content)
+
+def runs_in_process(script_path: Path) -> bool:
+    """
+    Whether a script should run inside the scheduler's event loop.
+
+    Decided from the parsed source: importing the agent would already run its
+    top-level code, so agents without a module-level main()/run() go to a
+    subprocess without being imported.
+    """
+    if EXECUTION_MODE != "inprocess":
+        return False
+    metadata = load_metadata(script_path)
+    if metadata.get("in_process", "SCHEDULER_IN_PROCESS", True) is False:
+        return False
+    return bool(metadata.entry_points)
+
+
+def load_agent_module(script_path: Path) -> ModuleType:
+    """Import an agent module once and cache it for later runs."""
+    module = _agent_modules.get(script_path)
+    if module is not None:
+        return module
+
+    module_name = f"scheduler_agent_{script_path.stem}"
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    _agent_modules[script_path] = module
+    return module
+
+
+async def run_script_inprocess(
+    script_path: Path,
+    output: RunOutput | None = None,
+    upstream: dict[str, str] | None = None,
+) -> RunResult:
+    """
+    Run an agent's main()/run() coroutine inside the scheduler's event loop.
+
+    The module is imported on the first run only, so later runs skip
+    interpreter startup and the browser_use import entirely. Agents share the
+    scheduler's stdout here, so their output is not captured per run.
+
+    Returns:
+        RunResult: Outcome of the run (startup_seconds covers the import)
+    """
+    script_name = script_path.name
+    log_message(f"Starting {script_name} (in-process)...", "INFO")
+
+    channel = RunChannel(script_name, uuid.uuid4().hex)
+
+    try:
+        # Let agents import helpers that live next to them
+        if str(script_path.parent) not in sys.path:
+            sys.path.insert(0, str(script_path.parent))
+
+        # Messages reported through agents/_channel.py go straight to this
+        # run's channel, and upstream results come from it (both are context
+        # variables, so they are per-task). Set before the first import, so
+        # top-level code of the agent sees them too.
+        sink_token = upstream_token = None
+        channel_module = sys.modules.get("_channel")
+        if channel_module is None and (script_path.parent / "_channel.py").exists():
+            channel_module = importlib.import_module("_channel")
+        if channel_module is not None:
+
+            def sink(message: dict):
+                message.update(run_id=channel.run_id, script=script_name)
+                channel.handle(message)
+
+            sink_token = channel_module.current_sink.set(sink)
+            upstream_token = channel_module.current_upstream.set(upstream or {})
+
+        try:
+            module = load_agent_module(script_path)
+            entry = getattr(module, "run", None) or getattr(module, "main", None)
+            if not callable(entry):
+                raise RuntimeError("main()/run() is not callable after import")
+            result = entry()
+            if inspect.isawaitable(result):
+                result = await result
+        finally:
+            if sink_token is not None:
+                channel_module.current_sink.reset(sink_token)
+                channel_module.current_upstream.reset(upstream_token)
+
+        # Agents without a channel report through main()'s return value
+        if channel.final is None and result is not None:
+            if isinstance(result, dict):
+                result = result.get("result")
+            channel.handle(
+                {"type": "result", "success": bool(result), "result": str(result)}
+            )
+
+        return channel.run_result()
+
+    except SystemExit as e:
+        # sys.exit() in an in-process agent must not stop the scheduler
+        return channel.run_result(e.code)
+    except Exception as e:
+        return execution_failed(script_name, e)
+
+
+class WarmWorkerPool:
+    """
+    Pool of pre-warmed worker processes (see worker.py).
+
+    Workers pay the interpreter startup and browser_use import once, then run
+    jobs until they have run SCHEDULER_WORKER_MAX_JOBS scripts or grown past
+    SCHEDULER_WORKER_MAX_MEMORY_MB, at which point they are replaced.
+    """
+
+    def __init__(self, size: int = MAX_CONCURRENCY):
+        self.size = size
+        self._idle: asyncio.Queue[WorkerProcess] = asyncio.Queue()
+        self._all: set[WorkerProcess] = set()
+
+    async def start(self):
+        """Spawn and pre-warm all workers."""
+        workers = await asyncio.gather(*(self._spawn() for _ in range(self.size)))
+        for worker in workers:
+            self._idle.put_nowait(worker)
+
+    async def _spawn(self) -> WorkerProcess:
+        worker = await WorkerProcess.spawn()
+        self._all.add(worker)
+        return worker
+
+    async def acquire(self) -> WorkerProcess:
+        """Take an idle worker, spawning one if none is available yet."""
+        if self._idle.empty() and len(self._all) < self.size:
+            return await self._spawn()
+        return await self._idle.get()
+
+    async def release(self, worker: WorkerProcess):
+        """Return a worker to the pool, recycling it if it hit a limit."""
+        exhausted = (
+            worker.jobs_run >= WORKER_MAX_JOBS
+            or worker.rss_mb >= WORKER_MAX_MEMORY_MB
+            or worker.process.returncode is not None
+        )
+        if not exhausted:
+            self._idle.put_nowait(worker)
+            return
+
+        log_message(
+            f"Recycling worker {worker.process.pid} after {worker.jobs_run} job(s), "
+            f"{worker.rss_mb:.0f} MB"
+        )
+        self._all.discard(worker)
+        await worker.close()
+        self._idle.put_nowait(await self._spawn())
+
+    async def discard(self, worker: WorkerProcess):
+        """Kill a worker that can't be reused (e.g. timed out) and start a fresh one."""
+        self._all.discard(worker)
+        await kill_process_tree(worker.process)
+        self._idle.put_nowait(await self._spawn())
+
+    async def close(self):
+        """Stop every worker."""
+        await asyncio.gather(*(worker.close() for worker in self._all))
+        self._all.clear()
+
+
+# Shared pool of warm workers, created on first use in "worker" mode
+_warm_workers: WarmWorkerPool | None = None
+
+
+async def get_warm_workers() -> WarmWorkerPool:
+    """Return the warm worker pool, starting it on first use."""
+    global _warm_workers
+    if _warm_workers is None:
+        _warm_workers = WarmWorkerPool()
+        await _warm_workers.start()
+    return _warm_workers
+
+
+async def run_script_worker(
+    script_path: Path,
+    output: RunOutput | None = None,
+    env: dict[str, str] | None = None,
+) -> RunResult:
+    """
+    Run a script on a pre-warmed worker process and read its result channel.
+
+    The worker's stdout/stderr is attributed to the job it is running, so
+    `output` gets exactly this run's lines.
+
+    Returns:
+        RunResult: Outcome of the run (startup_seconds is the time from
+        dispatch until the agent reported its first message)
+    """
+    script_name = script_path.name
+    log_message(f"Starting {script_name} (warm worker)...", "INFO")
+
+    output = output or open_run_output(script_name)
+    channel = RunChannel(script_name, uuid.uuid4().hex, output)
+
+    try:
+        workers = await get_warm_workers()
+        worker = await workers.acquire()
+        channel.dispatched_at = time.monotonic()
+        try:
+            finished = await worker.run(
+                channel.run_id,
+                script_path.resolve(),
+                {**os.environ, **channel.env(), **(env or {})},
+                on_message=channel.handle,
+                output=output,
+            )
+        except BaseException:
+            # The worker may be mid-job or dead - never hand it out again
+            await workers.discard(worker)
+            raise
+        await workers.release(worker)
+
+        return channel.run_result(finished["returncode"])
+
+    except Exception as e:
+        return execution_failed(script_name, e)
+
+
+# Warm cloud browser sessions, created on first use
+_browser_sessions: BrowserSessionPool | None = None
+
+
+async def allow_warm_browser() -> bool:
+    """Warm browsers count against the shared sandbox rate and budget too."""
+    return (await LIMITER.acquire("sandbox"))["granted"]
+
+
+def get_browser_sessions() -> BrowserSessionPool:
+    """Return the warm browser session pool, starting it on first use."""
+    global _browser_sessions
+    if _browser_sessions is None:
+        _browser_sessions = BrowserSessionPool(
+            api_key=os.getenv("BROWSER_USE_API_KEY", ""),
+            idle_ttl=BROWSER_IDLE_TTL,
+            session_timeout_minutes=int(os.getenv("CLOUD_TIMEOUT", 60)),
+            proxy_country_code=os.getenv("CLOUD_PROXY_COUNTRY_CODE"),
+            before_create=allow_warm_browser,
+        )
+        _browser_sessions.start()
+    return _browser_sessions
+
+
+def wants_warm_browser(script_path: Path) -> bool:
+    """Whether a script should get a warm browser session (KEEP_BROWSER_WARM)."""
+    if BROWSER_IDLE_TTL <= 0:
+        return False
+    metadata = load_metadata(script_path)
+    return metadata.get("keep_browser_warm", "KEEP_BROWSER_WARM", False) is True
+
+
+def get_dependencies(script_path: Path) -> set[str]:
+    """Agents a script depends on ("depends_on" metadata or DEPENDS_ON)."""
+    value = load_metadata(script_path).get("depends_on", "DEPENDS_ON", [])
+    if isinstance(value, str):
+        value = [value]
+    try:
+        return {str(name) for name in value}
+    except TypeError:
+        log_message(f"Invalid depends_on for {script_path.name}: {value}", "ERROR")
+        return set()
+
+
+async def shutdown_executors():
+    """Stop long-lived execution resources (warm workers, browsers, limiter)."""
+    global _warm_workers, _browser_sessions
+    if _warm_workers is not None:
+        await _warm_workers.close()
+        _warm_workers = None
+    if _browser_sessions is not None:
+        await _browser_sessions.close()
+        _browser_sessions = None
+    await LIMITER.close()
+
+
+async def run_script(
+    script_path: Path,
+    output: RunOutput | None = None,
+    inputs: dict[str, RunResult] | None = None,
+) -> RunResult:
+    """
+    Run a script with the configured execution mode.
+
+    `inputs` are the results of the agents the script depends on; their
+    output is handed to the agent (see upstream_results() in agents/_channel.py).
+    """
+    upstream = (
+        {name: str(result.output) for name, result in inputs.items()}
+        if inputs
+        else None
+    )
+    if runs_in_process(script_path):
+        return await run_script_inprocess(script_path, output, upstream)
+
+    # Hand the profile's warm browser to the run, if the agent wants one
+    session: BrowserSession | None = None
+    env = upstream_env(upstream)
+    if wants_warm_browser(script_path):
+        sessions = get_browser_sessions()
+        session, reused = await sessions.acquire(os.getenv("CLOUD_PROFILE_ID"))
+        if session is not None:
+            log_message(
+                f"{script_path.name}: "
+                f"{'reusing warm' if reused else 'started new'} browser {session.id}"
+            )
+            env |= {
+                "SCHEDULER_BROWSER_CDP_URL": session.cdp_url,
+                "SCHEDULER_BROWSER_SESSION_ID": session.id,
+                "SCHEDULER_BROWSER_REUSED": "1" if reused else "0",
+            }
+
+    result = None
+    try:
+        if EXECUTION_MODE == "worker":
+            result = await run_script_worker(script_path, output, env)
         else:
-            # File doesn't exist - script failed or didn't write output
+            result = await run_script_subprocess(script_path, output, env)
+        return result
+    finally:
+        if session is not None:
+            # A failed run may have left the browser in a bad state
+            await sessions.release(
+                session, healthy=result is not None and result.success
+            )
+
+
+@dataclass(order=True)
+class Job:
+    """A queued agent run, ordered by priority then expected runtime."""
+
+    sort_key: tuple
+    script: Path = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    attempt: int = field(compare=False, default=1)
+    # When the schedule wanted the run to start (monotonic clock)
+    planned_at: float = field(compare=False, default=0.0)
+    # Results of the agents this one depends on, by script name
+    inputs: dict | None = field(compare=False, default=None)
+
+
+class WorkerPool:
+    """
+    Run scripts through a fixed number of workers fed by a priority queue.
+
+    Agents with a higher priority (SCHEDULER_AGENT_PRIORITIES) are started
+    first; among equal priorities, agents that finished fastest last time go
+    first so short agents are not stuck behind slow ones.
+
+    Failed runs are put back in the queue after a backoff delay (the worker is
+    free in the meantime) and the job's future only resolves with the final
+    attempt. Every attempt feeds the agent's circuit breaker.
+
+    Agents in a concurrency class (SCHEDULER_CONCURRENCY_LIMITS) whose class is
+    at its limit are parked without holding a worker, and put back in the
+    queue when a run of their class finishes.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENCY,
+        history: RunHistory | None = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.history = history
+        # Set by start_metrics() when the /metrics endpoint is enabled
+        self.metrics: SchedulerMetrics | None = None
+        self.running = 0
+        self.queue: asyncio.PriorityQueue[Job] = asyncio.PriorityQueue()
+        self.max_queue_depth = 0
+        self.last_durations: dict[str, float] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self._sequence = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self._retry_timers: set[asyncio.TimerHandle] = set()
+        # Runs per concurrency class, and jobs parked until their class has room
+        self.class_running: dict[str, int] = {}
+        self._parked: dict[str, list[Job]] = {}
+
+    def start(self):
+        """Start the worker tasks."""
+        for _ in range(self.max_concurrency):
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def close(self):
+        """Stop the worker tasks (queued jobs are cancelled)."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+        for timer in self._retry_timers:
+            timer.cancel()
+        self._retry_timers.clear()
+
+        while not self.queue.empty():
+            self.queue.get_nowait().future.cancel()
+        for parked in self._parked.values():
+            for job in parked:
+                job.future.cancel()
+        self._parked.clear()
+
+    @property
+    def queued(self) -> int:
+        """Jobs waiting for a worker or for room in their concurrency class."""
+        return self.queue.qsize() + sum(len(jobs) for jobs in self._parked.values())
+
+    def submit(
+        self,
+        script: Path,
+        planned_at: float | None = None,
+        inputs: dict[str, RunResult] | None = None,
+    ) -> asyncio.Future:
+        """
+        Queue a script and return a future resolving to its RunResult.
+
+        `planned_at` is the monotonic time the schedule wanted the run to start
+        (default: now); the delay until it actually starts is the schedule lag.
+        `inputs` are the upstream results handed to a dependent agent.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(script, future, planned_at=planned_at, inputs=inputs)
+        return future
+
+    def _enqueue(
+        self,
+        script: Path,
+        future: asyncio.Future,
+        attempt: int = 1,
+        planned_at: float | None = None,
+        inputs: dict[str, RunResult] | None = None,
+    ):
+        priority = get_priority(script)
+        expected = self.last_durations.get(script.name, 0.0)
+        now = time.monotonic()
+        job = Job(
+            sort_key=(-priority, expected, next(self._sequence)),
+            script=script,
+            enqueued_at=now,
+            future=future,
+            attempt=attempt,
+            planned_at=now if planned_at is None else planned_at,
+            inputs=inputs,
+        )
+        self.queue.put_nowait(job)
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def breaker(self, script_name: str) -> CircuitBreaker:
+        """Return the circuit breaker of an agent."""
+        breaker = self.breakers.get(script_name)
+        if breaker is None:
+            breaker = CircuitBreaker(CIRCUIT_THRESHOLD, CIRCUIT_COOLDOWN)
+            self.breakers[script_name] = breaker
+        return breaker
+
+    def _retry(self, job: Job) -> bool:
+        """Schedule another attempt of a failed job if it has retries left."""
+        breaker = self.breaker(job.script.name)
+        if job.attempt > get_retries(job.script) or breaker.state != "closed":
+            return False
+
+        delay = RETRY_POLICY.delay(job.attempt)
+        log_message(
+            f"{job.script.name} failed (attempt {job.attempt}), "
+            f"retrying in {delay:.1f}s",
+            "WARNING",
+        )
+
+        def requeue():
+            self._retry_timers.discard(timer)
+            if not job.future.done():
+                self._enqueue(
+                    job.script, job.future, job.attempt + 1, inputs=job.inputs
+                )
+
+        timer = asyncio.get_running_loop().call_later(delay, requeue)
+        self._retry_timers.add(timer)
+        return True
+
+    def _release_class(self, concurrency_class: str):
+        """Free a slot of a concurrency class and requeue its next parked job."""
+        self.class_running[concurrency_class] -= 1
+        parked = self._parked.get(concurrency_class)
+        while parked:
+            job = heapq.heappop(parked)
+            if not job.future.cancelled():
+                self.queue.put_nowait(job)
+                break
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                if job.future.cancelled():
+                    continue
+
+                try:
+                    concurrency_class = get_concurrency_class(job.script)
+                except Exception as e:
+                    self._crashed(job, e)
+                    continue
+                limit = CONCURRENCY_LIMITS.get(concurrency_class, 0)
+                if limit:
+                    if self.class_running.get(concurrency_class, 0) >= limit:
+                        heapq.heappush(
+                            self._parked.setdefault(concurrency_class, []), job
+                        )
+                        continue
+                    self.class_running[concurrency_class] = (
+                        self.class_running.get(concurrency_class, 0) + 1
+                    )
+
+                # Run the job as its own task so cancelling the job's future
+                # (overlap policy "cancel") stops the run but not this worker
+                run = asyncio.create_task(self._run(job))
+                job.future.add_done_callback(
+                    lambda future, run=run: run.cancel() if future.cancelled() else None
+                )
+                try:
+                    await asyncio.wait([run])
+                except asyncio.CancelledError:
+                    run.cancel()
+                    raise
+                finally:
+                    if limit:
+                        self._release_class(concurrency_class)
+                if not run.cancelled() and run.exception() is not None:
+                    self._crashed(job, run.exception())
+            finally:
+                self.queue.task_done()
+
+    def _crashed(self, job: Job, error: BaseException):
+        """Fail a job whose run raised, so the agent isn't stuck as running."""
+        import traceback
+
+        script_name = job.script.name
+        log_message(f"{script_name}: scheduler error: {error!r}", "ERROR")
+        log_message(
+            "".join(
+                traceback.format_exception(type(error), error, error.__traceback__)
+            ),
+            "ERROR",
+        )
+        if not job.future.done():
+            job.future.set_result(
+                RunResult(
+                    script_name,
+                    False,
+                    f"Scheduler error: {error}",
+                    attempts=job.attempt,
+                )
+            )
+
+    async def _run(self, job: Job):
+        script_name = job.script.name
+        over_budget = LIMITER.budget_exhausted()
+        if over_budget is not None:
+            # Not a failure of the agent: no retry, no circuit breaker
+            log_message(f"Not starting {script_name}: {over_budget}", "WARNING")
+            if not job.future.done():
+                job.future.set_result(
+                    RunResult(
+                        script_name,
+                        False,
+                        f"Not started: {over_budget}",
+                        attempts=job.attempt,
+                    )
+                )
+            return
+
+        admission_seconds = await ADMISSION.admit(
+            lambda reason: log_message(f"Holding {script_name}: {reason}")
+        )
+        if admission_seconds >= ADMISSION.poll_interval:
+            log_message(f"Admitted {script_name} after {admission_seconds:.1f}s")
+
+        timeout = get_timeout(job.script)
+        started_wall = time.time()
+        started_at = time.monotonic()
+        output = open_run_output(script_name)
+        self.running += 1
+        try:
+            result = await asyncio.wait_for(
+                run_script(job.script, output, job.inputs), timeout
+            )
+        except asyncio.TimeoutError:
+            log_message(
+                f"{script_name} timed out after {timeout:.0f}s - process killed",
+                "ERROR",
+            )
+            message = f"Timed out after {timeout:.0f}s"
+            if output.tail():
+                message += f"\n\n{output.tail()}"
+            result = RunResult(script_name, False, message)
+        finally:
+            self.running -= 1
+
+        result.wait_seconds = started_at - job.enqueued_at
+        result.admission_seconds = admission_seconds
+        result.duration_seconds = time.monotonic() - started_at
+        result.started_at = started_wall
+        result.attempts = job.attempt
+        self.last_durations[script_name] = result.duration_seconds
+
+        state = self.breaker(script_name).record(result.success)
+        if state == "open":
             log_message(
-                f"{script_name} failed - no result file found (exit code: {returncode})",
+                f"Circuit opened for {script_name}: paused for "
+                f"{CIRCUIT_COOLDOWN:.0f}s after {self.breaker(script_name).failures} "
+                "consecutive failure(s)",
                 "ERROR",
             )
-            return (
+        elif state == "closed":
+            log_message(f"Circuit closed for {script_name}: agent recovered")
+
+        if self.metrics is not None:
+            self.metrics.record_run(
                 script_name,
-                False,
-                f"Script exited with code {returncode}, no result file generated",
+                result.success,
+                result.duration_seconds,
+                result.startup_seconds,
+                result.admission_seconds,
+                max(0.0, started_at - job.planned_at),
             )
 
-    except Exception as e:
-        log_message(f"{script_name} execution failed: {str(e)}", "ERROR")
-        import traceback
+        if self.history is not None:
+            self.history.record(
+                agent=script_name,
+                started_at=result.started_at,
+                duration=result.duration_seconds,
+                exit_code=result.exit_code,
+                result_size=len(str(result.output).encode()),
+                success=result.success,
+            )
 
-        error_trace = traceback.format_exc()
-        log_message(error_trace, "ERROR")
-        return (script_name, False, str(e))
+        if not result.success and not job.future.done() and self._retry(job):
+            return
+
+        if not job.future.done():
+            job.future.set_result(result)
+
+
+def format_agent_metrics(metrics: dict) -> str:
+    """One-line summary of the metrics an agent reported with its result."""
+    parts = []
+    if metrics.get("provisioning_seconds") is not None:
+        parts.append(f"provisioning {metrics['provisioning_seconds']:.2f}s")
+    if metrics.get("warm_browser"):
+        parts.append("warm browser")
+    if metrics.get("wall_seconds") is not None:
+        parts.append(f"wall {metrics['wall_seconds']:.2f}s")
+    if metrics.get("steps") is not None:
+        parts.append(f"{metrics['steps']} step(s)")
+    if metrics.get("result_bytes") is not None:
+        parts.append(f"result {metrics['result_bytes']} bytes")
+    if (metrics.get("rate_limit_seconds") or 0) >= 0.01:
+        parts.append(f"rate limited {metrics['rate_limit_seconds']:.2f}s")
+    if metrics.get("cost") is not None:
+        parts.append(f"cost ${metrics['cost']:.4f}")
+    return ", ".join(parts)
+
+
+def print_result(result: RunResult):
+    """Display the output of a single agent run."""
+    print(f"{'=' * 80}")
+    print(f"  Script: {result.script_name}")
+    print(f"  Status: {'✓ SUCCESS' if result.success else '✗ FAILED'}")
+    attempts = f", attempts: {result.attempts}" if result.attempts > 1 else ""
+    admission = (
+        f" (admission {result.admission_seconds:.2f}s)"
+        if result.admission_seconds
+        else ""
+    )
+    print(
+        f"  Queued: {result.wait_seconds:.2f}s{admission}, "
+        f"startup: {result.startup_seconds * 1000:.0f}ms, "
+        f"ran: {result.duration_seconds:.2f}s{attempts}"
+    )
+    if result.agent_metrics:
+        print(f"  Agent:  {format_agent_metrics(result.agent_metrics)}")
+    print(f"{'=' * 80}")
+
+    if result.output:
+        print(result.output)
+    else:
+        print("(no output)")
+
+    print()
 
 
-async def run_all_scripts(scripts: list[Path]) -> dict:
+async def run_all_scripts(scripts: list[Path], pool: WorkerPool) -> dict:
     """
-    Run all scripts concurrently as subprocesses and display their outputs.
+    Run all scripts through the worker pool and display their outputs.
+
+    Agents with dependencies (DEPENDS_ON) start as soon as their upstream
+    agents have finished and get their results.
 
     Returns:
         dict: Summary of execution results
     """
-    log_message(f"Running {len(scripts)} script(s) concurrently...")
+    log_message(
+        f"Running {len(scripts)} script(s) with up to "
+        f"{pool.max_concurrency} at a time..."
+    )
+    if STAGGER_WINDOW > 0:
+        log_message(f"Spreading starts over {STAGGER_WINDOW:.0f}s")
 
     start_time = datetime.now()
-
-    # Run all scripts concurrently
-    tasks = [run_script_subprocess(script) for script in scripts]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    pool.max_queue_depth = 0
+
+    by_name = {script.name: script for script in scripts}
+    graph = AgentGraph({script.name: get_dependencies(script) for script in scripts})
+
+    async def submit(script_name: str, inputs: dict) -> RunResult:
+        # Hold each independent script back by its stagger offset, then let
+        # the pool decide the order they start in
+        if graph.is_root(script_name):
+            await asyncio.sleep(stagger_offset(script_name, STAGGER_WINDOW))
+        return await pool.submit(by_name[script_name], inputs=inputs)
+
+    results_by_name = await run_graph(
+        graph,
+        set(by_name),
+        submit,
+        on_skip=lambda name, reason: log_message(
+            f"Skipping {name}: {reason}", "WARNING"
+        ),
+    )
+    results = [results_by_name[script.name] for script in scripts]
 
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
@@ -130,49 +1319,72 @@ async def run_all_scripts(scripts: list[Path]) -> dict:
     print("=" * 80 + "\n")
 
     for result in results:
-        if isinstance(result, tuple):
-            script_name, success, output = result
-
-            print(f"{'=' * 80}")
-            print(f"  Script: {script_name}")
-            print(f"  Status: {'✓ SUCCESS' if success else '✗ FAILED'}")
-            print(f"{'=' * 80}")
-
-            if output:
-                print(output)
-            else:
-                print("(no output)")
-
-            print()
+        if isinstance(result, RunResult):
+            print_result(result)
 
     print("=" * 80)
 
     # Summarize results
-    successful = sum(1 for r in results if isinstance(r, tuple) and r[1])
-    failed = len(results) - successful
+    completed = [r for r in results if isinstance(r, RunResult)]
+    successful = sum(1 for r in completed if r.success)
+    failed = len(completed) - successful
+    skipped = len(results) - len(completed)
+    waits = [r.wait_seconds for r in completed]
+    avg_wait = sum(waits) / len(waits) if waits else 0.0
+    max_wait = max(waits, default=0.0)
+    admissions = [r.admission_seconds for r in completed]
+    avg_admission = sum(admissions) / len(admissions) if admissions else 0.0
+    max_admission = max(admissions, default=0.0)
+    startups = [r.startup_seconds for r in completed]
+    avg_startup = sum(startups) / len(startups) if startups else 0.0
+    starts = [r.started_at for r in completed if r.started_at]
+    start_spread = max(starts) - min(starts) if starts else 0.0
 
     summary = {
         "total": len(scripts),
         "successful": successful,
         "failed": failed,
+        "skipped": skipped,
         "duration": duration,
+        "max_queue_depth": pool.max_queue_depth,
+        "avg_wait": avg_wait,
+        "max_wait": max_wait,
+        "avg_admission": avg_admission,
+        "max_admission": max_admission,
+        "avg_startup": avg_startup,
+        "start_spread": start_spread,
         "results": results,
     }
 
     log_message(
         f"Batch complete: {successful}/{len(scripts)} successful, "
-        f"{failed} failed, duration: {duration:.2f}s",
-        "SUCCESS" if failed == 0 else "WARNING",
+        f"{failed} failed, {skipped} skipped, duration: {duration:.2f}s",
+        "SUCCESS" if failed == skipped == 0 else "WARNING",
+    )
+    log_message(
+        f"Queue: max depth {pool.max_queue_depth}, "
+        f"wait avg {avg_wait:.2f}s / max {max_wait:.2f}s, "
+        f"startup avg {avg_startup * 1000:.0f}ms, "
+        f"start spread {start_spread:.2f}s"
     )
+    if ADMISSION.enabled:
+        log_message(
+            f"Admission wait avg {avg_admission:.2f}s / max {max_admission:.2f}s"
+        )
 
     return summary
 
 
-def discover_scripts() -> list[Path]:
+def discover_scripts(log_skipped: bool = True) -> list[Path]:
     """
     Automatically discover all Python scripts in the scripts directory.
 
     Ignores files starting with _ or . (for disabled/hidden scripts).
+    Set log_skipped=False for the periodic rescans done by hot reload.
+
+    Each script's SCHEDULER metadata is read here by parsing the file, never
+    importing it; unchanged files are served from the mtime cache, so a rescan
+    of hundreds of agents costs one stat() per file.
 
     Returns:
         list[Path]: List of discovered script paths
@@ -191,28 +1403,67 @@ def discover_scripts() -> list[Path]:
     for script_path in scripts_dir.glob("*.py"):
         # Ignore files starting with _ or .
         if script_path.name.startswith(("_", ".")):
-            log_message(f"Skipping disabled script: {script_path.name}", "INFO")
+            if log_skipped:
+                log_message(f"Skipping disabled script: {script_path.name}", "INFO")
             continue
 
+        metadata = load_metadata(script_path)
+        if metadata.errors and not metadata.errors_logged:
+            for error in metadata.errors:
+                log_message(f"{script_path.name}: {error}", "ERROR")
+            metadata.errors_logged = True
+
         discovered.append(script_path)
 
+    prune_metadata(discovered)
+
     # Sort for consistent ordering
     discovered.sort(key=lambda p: p.name)
 
     return discovered
 
 
+def get_schedule(script: Path):
+    """Return the schedule for a script (environment, metadata or default)."""
+    script_name = script.name
+    schedule = None
+    value = agent_setting(script, "schedule", AGENT_SCHEDULES)
+    if value is not None:
+        try:
+            schedule = parse_schedule(str(value))
+        except (TypeError, ValueError) as e:
+            log_message(f"Invalid schedule for {script_name}: {e}", "ERROR")
+    if schedule is None:
+        schedule = parse_schedule(f"{INTERVAL_SECONDS}s")
+
+    # An offset beyond the interval would just push runs into the next tick
+    window = min(STAGGER_WINDOW, getattr(schedule, "seconds", STAGGER_WINDOW))
+    schedule.offset = stagger_offset(script_name, window)
+    return schedule
+
+
 async def scheduler_loop():
-    """Main scheduler loop that runs all discovered scripts every INTERVAL_MINUTES."""
-    log_message(
-        f"Scheduler started - will run scripts every {INTERVAL_MINUTES} minutes"
-    )
+    """
+    Main scheduler loop that runs every discovered script on its own schedule.
+
+    Next fire times are kept in a min-heap on the monotonic clock. When an
+    agent is due it is handed to the worker pool and its next fire time is
+    planned from the previous one, so a slow agent never delays the others.
+
+    Agents with dependencies have no timer: when an upstream agent finishes,
+    everything downstream of it runs in topological order (see dag.py).
+
+    Every SCHEDULER_RELOAD_SECONDS the scripts directory is rescanned (a cheap
+    mtime scan): new agents join the schedule, disabled or deleted ones leave
+    it and edited ones are reloaded, all without touching runs in flight.
+    """
+    log_message("Scheduler started - each agent runs on its own schedule")
     log_message("Press Ctrl+C to stop")
 
     # Discover scripts in the directory
     scripts = discover_scripts()
 
-    if not scripts:
+    if not scripts and RELOAD_SECONDS <= 0:
         log_message("Error: No scripts found to run!", "ERROR")
         return
 
@@ -220,48 +1471,442 @@ async def scheduler_loop():
     log_message(f"Discovered {len(scripts)} script(s): {', '.join(script_names)}")
 
     execution_count = 0
-    total_successful = 0
-    total_failed = 0
+    totals = {"successful": 0, "failed": 0, "skipped": 0, "cancelled": 0}
+    in_flight: dict[str, asyncio.Future] = {}
+    # Agents with one run queued behind the in-flight one ("queue" policy)
+    queued_reruns: dict[str, Path] = {}
+
+    # Live schedule: heap entries are (fire_at, script_name, generation); an
+    # entry whose generation is outdated belongs to a removed or rescheduled
+    # agent and is dropped when it reaches the top of the heap
+    agents: dict[str, Path] = {}
+    schedules = {}
+    mtimes: dict[str, int] = {}
+    generations: dict[str, int] = {}
+    timers: list[tuple[float, str, int]] = []
+
+    # Dependency graph, the last successful result of every agent (inputs of
+    # dependents outside the current run) and the dependency runs in progress
+    dependencies: dict[str, set[str]] = {}
+    graph = AgentGraph({})
+    latest_results: dict[str, RunResult] = {}
+    waves: set[asyncio.Task] = set()
+
+    def add_agent(script: Path):
+        schedule = get_schedule(script)
+        agents[script.name] = script
+        schedules[script.name] = schedule
+        mtimes[script.name] = script.stat().st_mtime_ns
+        generations[script.name] = generations.get(script.name, 0) + 1
+        dependencies[script.name] = get_dependencies(script)
+        if dependencies[script.name]:
+            # Runs when its upstream agents finish, not on a timer
+            log_message(
+                f"  {script.name}: after {', '.join(sorted(dependencies[script.name]))}"
+            )
+            return
+        fire_at = schedule.next_fire(None, time.monotonic())
+        heapq.heappush(timers, (fire_at, script.name, generations[script.name]))
+        log_message(f"  {script.name}: {schedule}")
+
+    def remove_agent(script_name: str):
+        # Runs already in flight finish normally; only future runs are dropped
+        agents.pop(script_name)
+        schedules.pop(script_name)
+        mtimes.pop(script_name)
+        dependencies.pop(script_name)
+        latest_results.pop(script_name, None)
+        generations[script_name] += 1
+        queued_reruns.pop(script_name, None)
+        forget_agent_module(script_name)
+
+    def rebuild_graph():
+        nonlocal graph
+        previous = graph.problems
+        graph = AgentGraph(dict(dependencies))
+        for script_name, problem in graph.problems.items():
+            if previous.get(script_name) != problem:
+                log_message(f"{script_name} will not run: {problem}", "ERROR")
+
+    def rescan():
+        current = {script.name: script for script in discover_scripts(False)}
+
+        for script_name in list(agents):
+            if script_name not in current:
+                log_message(f"Agent removed or disabled: {script_name}")
+                remove_agent(script_name)
+
+        for script_name, script in current.items():
+            try:
+                mtime = script.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+
+            if script_name not in agents:
+                log_message(f"New agent discovered: {script_name}")
+                add_agent(script)
+            elif mtime != mtimes[script_name]:
+                log_message(f"Agent changed, reloading: {script_name}")
+                forget_agent_module(script_name)
+                mtimes[script_name] = mtime
+                schedule = get_schedule(script)
+                if str(schedule) != str(schedules[script_name]) or (
+                    get_dependencies(script) != dependencies[script_name]
+                ):
+                    remove_agent(script_name)
+                    add_agent(script)
+
+        rebuild_graph()
+
+    def start_run(
+        script: Path,
+        planned_at: float | None = None,
+        inputs: dict[str, RunResult] | None = None,
+    ) -> asyncio.Future:
+        nonlocal execution_count
+        execution_count += 1
+        future = pool.submit(script, planned_at, inputs)
+        in_flight[script.name] = future
+        future.add_done_callback(lambda f, name=script.name: on_run_done(name, f))
+        return future
+
+    def on_run_done(script_name: str, future: asyncio.Future):
+        if in_flight.get(script_name) is future:
+            del in_flight[script_name]
+
+        if future.cancelled():
+            totals["cancelled"] += 1
+        else:
+            result = future.result()
+            print_result(result)
+            totals["successful" if result.success else "failed"] += 1
+            if result.success:
+                latest_results[script_name] = result
+            # Dependents of a scheduled agent run right away; dependents of
+            # dependents are started by the same dependency run
+            if graph.is_root(script_name) and graph.dependents.get(script_name):
+                start_downstream(script_name, result)
+
+        rerun = queued_reruns.pop(script_name, None)
+        if (
+            rerun is not None
+            and script_name not in in_flight
+            and pool.breaker(script_name).state == "closed"
+        ):
+            log_message(f"Starting queued run of {script_name}")
+            start_run(rerun)
+
+    def skip_downstream(script_name: str, reason: str):
+        totals["skipped"] += 1
+        log_message(f"Skipping {script_name}: {reason}", "WARNING")
+
+    async def run_downstream(script_name: str, inputs: dict) -> RunResult | None:
+        script = agents.get(script_name)
+        if script is None:
+            skip_downstream(script_name, "agent was removed")
+        elif script_name in in_flight:
+            skip_downstream(script_name, "previous run still in progress")
+        elif not pool.breaker(script_name).allow():
+            skip_downstream(script_name, "circuit open")
+        else:
+            return await start_run(script, inputs=inputs)
+        return None
+
+    def start_downstream(script_name: str, result: RunResult):
+        nodes = graph.descendants(script_name)
+        log_message(
+            f"Running {len(nodes)} agent(s) downstream of {script_name}: "
+            f"{', '.join(sorted(nodes))}"
+        )
+        wave = asyncio.create_task(
+            run_graph(
+                graph,
+                nodes,
+                run_downstream,
+                results={script_name: result},
+                latest=latest_results,
+                on_skip=skip_downstream,
+            )
+        )
+        waves.add(wave)
+        wave.add_done_callback(waves.discard)
+
+    def heartbeat():
+        nonlocal owned
+        current = cluster.heartbeat(NODE_ID, sorted(agents), LEASE_TTL)
+        if current != owned:
+            log_message(
+                f"Cluster node {NODE_ID} owns {len(current)} of {len(agents)} "
+                f"agent(s): {', '.join(sorted(current)) or '(none)'}"
+            )
+        owned = current
+
+    def claim_tick(script_name: str) -> bool:
+        # Only the lease holder runs an agent, and only once per tick even
+        # while the lease is moving between nodes
+        if script_name not in owned:
+            return False
+        min_spacing = getattr(schedules[script_name], "seconds", 60) / 2
+        if cluster.claim_run(script_name, NODE_ID, min_spacing):
+            return True
+        log_message(f"Skipping {script_name}: already run by another node this tick")
+        return False
+
+    for script in scripts:
+        add_agent(script)
+    rebuild_graph()
+
+    history = open_history()
+    pool = WorkerPool(history=history)
+    pool.start()
+    await start_metrics(pool)
+    await start_limiter()
+
+    cluster = open_cluster()
+    # Agents this node holds a lease for (cluster mode only)
+    owned: set[str] = set()
+
+    next_rescan = time.monotonic() + RELOAD_SECONDS
+    next_heartbeat = time.monotonic()
 
     try:
         while True:
-            execution_count += 1
-            log_message("=" * 60)
-            log_message(f"Execution batch #{execution_count} starting...")
-
-            # Run all scripts
-            summary = await run_all_scripts(scripts)
-
-            total_successful += summary["successful"]
-            total_failed += summary["failed"]
-
-            # Wait for the next interval
-            log_message(f"Next execution in {INTERVAL_MINUTES} minutes...")
-            log_message("=" * 60)
-            await asyncio.sleep(INTERVAL_SECONDS)
+            now = time.monotonic()
+            if RELOAD_SECONDS > 0 and now >= next_rescan:
+                rescan()
+                next_rescan = now + RELOAD_SECONDS
+            if cluster is not None and now >= next_heartbeat:
+                heartbeat()
+                next_heartbeat = now + LEASE_TTL / 3
+
+            # Sleep until the next agent is due (or the next rescan/heartbeat)
+            wake_at = timers[0][0] if timers else now + IDLE_SLEEP_SECONDS
+            if RELOAD_SECONDS > 0:
+                wake_at = min(wake_at, next_rescan)
+            if cluster is not None:
+                wake_at = min(wake_at, next_heartbeat)
+            delay = wake_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            if not timers:
+                continue
+
+            fire_at, script_name, generation = heapq.heappop(timers)
+            if generations.get(script_name) != generation:
+                continue
+            script = agents[script_name]
+
+            breaker = pool.breaker(script_name)
+            if cluster is not None and not claim_tick(script_name):
+                pass
+            elif script_name not in in_flight and not breaker.allow():
+                totals["skipped"] += 1
+                log_message(
+                    f"Skipping {script_name}: circuit open, next probe in "
+                    f"{breaker.retry_after():.0f}s",
+                    "WARNING",
+                )
+            elif script_name not in in_flight:
+                if breaker.state == "half_open":
+                    log_message(f"Probing {script_name} (circuit half-open)")
+                start_run(script, fire_at)
+            else:
+                # Previous run still queued or running - apply the overlap policy
+                policy = get_overlap_policy(script)
+                if policy == "cancel":
+                    log_message(
+                        f"Cancelling previous run of {script_name}: next run is due",
+                        "WARNING",
+                    )
+                    in_flight.pop(script_name).cancel()
+                    start_run(script, fire_at)
+                elif policy == "queue" and script_name not in queued_reruns:
+                    log_message(
+                        f"Queueing {script_name}: previous run still in progress"
+                    )
+                    queued_reruns[script_name] = script
+                else:
+                    # At most one queued run per agent, so work never piles up
+                    totals["skipped"] += 1
+                    log_message(
+                        f"Skipping {script_name}: previous run still in progress",
+                        "WARNING",
+                    )
+
+            next_fire = schedules[script_name].next_fire(fire_at, time.monotonic())
+            heapq.heappush(timers, (next_fire, script_name, generation))
+            log_message(
+                f"Next run of {script_name} in {next_fire - time.monotonic():.0f}s"
+            )
 
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        # asyncio.run() cancels the loop task when Ctrl+C is pressed
         log_message("=" * 60)
         log_message("Scheduler stopped by user", "INFO")
-        log_message(f"Total batches: {execution_count}")
-        log_message(f"Total successful runs: {total_successful}")
-        log_message(f"Total failed runs: {total_failed}")
+        log_message(f"Total runs started: {execution_count}")
+        log_message(f"Total successful runs: {totals['successful']}")
+        log_message(f"Total failed runs: {totals['failed']}")
+        log_message(f"Total skipped runs: {totals['skipped']}")
+        log_message(f"Total cancelled runs: {totals['cancelled']}")
         log_message("=" * 60)
     except Exception as e:
         log_message(f"Scheduler error: {str(e)}", "ERROR")
         raise
+    finally:
+        for wave in waves:
+            wave.cancel()
+        if pool.metrics is not None:
+            await pool.metrics.close()
+        await pool.close()
+        await shutdown_executors()
+        if history is not None:
+            history.close()
+        if cluster is not None:
+            # Hand our agents to the other nodes right away
+            cluster.leave(NODE_ID)
+            cluster.close()
+
+
+def open_cluster() -> LeaseStore | None:
+    """Open the cluster lease store (None unless SCHEDULER_CLUSTER_STORE is set)."""
+    if not CLUSTER_STORE:
+        return None
+    store = open_lease_store(CLUSTER_STORE, Path(__file__).parent)
+    log_message(f"Cluster mode: node {NODE_ID}, lease TTL {LEASE_TTL:.0f}s")
+    return store
+
+
+async def start_metrics(pool: WorkerPool):
+    """Serve the /metrics endpoint if SCHEDULER_METRICS_PORT is set."""
+    if not METRICS_PORT:
+        return
+
+    pool.metrics = SchedulerMetrics(
+        concurrent_runs=lambda: pool.running,
+        queue_depth=lambda: pool.queued,
+        admission_waiting=lambda: ADMISSION.waiting,
+        rate_limit_waiting=lambda: LIMITER.waiting,
+        spent_today=lambda: LIMITER.spent_today,
+    )
+    await pool.metrics.serve(METRICS_HOST, METRICS_PORT)
+    log_message(f"Metrics available at http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+
+
+async def start_limiter():
+    """Serve the shared rate limits and budget to agents, if any are set."""
+    if not LIMITER.enabled:
+        return
+
+    path = await LIMITER.serve()
+    # Inherited by every run: subprocesses, warm workers and in-process agents
+    os.environ["SCHEDULER_LIMITER_SOCKET"] = str(path)
+    limits = [
+        f"{resource} {bucket.rate * 60:g}/min"
+        for resource, bucket in LIMITER.buckets.items()
+    ]
+    if LIMITER.budget is not None:
+        limits.append(f"daily budget ${LIMITER.budget.limit:.2f}")
+    log_message(f"Shared limits: {', '.join(limits)}")
+
+
+async def run_once():
+    """Run every discovered script a single time and exit."""
+    scripts = discover_scripts()
+
+    if not scripts:
+        log_message("Error: No scripts found to run!", "ERROR")
+        return
+
+    history = open_history()
+    pool = WorkerPool(history=history)
+    pool.start()
+    try:
+        await start_limiter()
+        await run_all_scripts(scripts, pool)
+    finally:
+        await pool.close()
+        await shutdown_executors()
+        if history is not None:
+            history.close()
+
+
+def open_history() -> RunHistory | None:
+    """Open the run history database (None if SCHEDULER_HISTORY_DB is empty)."""
+    if not HISTORY_DB:
+        return None
+    return RunHistory(Path(__file__).parent / HISTORY_DB)
+
+
+def print_stats(window: str):
+    """Print per-agent latency percentiles and success rates from the history."""
+    history = open_history()
+    if history is None:
+        log_message("Run history is disabled (SCHEDULER_HISTORY_DB is empty)", "ERROR")
+        return
+
+    try:
+        stats = history.stats(parse_duration(window))
+    finally:
+        history.close()
+
+    print(f"Agent statistics for the last {window}:")
+    if not stats:
+        print("  (no runs recorded)")
+        return
+
+    print(
+        f"  {'Agent':<30} {'Runs':>6} {'Success':>8} {'p50':>9} {'p95':>9} {'p99':>9}"
+    )
+    for row in stats:
+        print(
+            f"  {row['agent']:<30} {row['runs']:>6} "
+            f"{row['success_rate']:>8.0%} "
+            f"{row['p50']:>8.1f}s {row['p95']:>8.1f}s {row['p99']:>8.1f}s"
+        )
 
 
 def main():
     """Entry point for the scheduler."""
+    parser = argparse.ArgumentParser(description="Browser-Use Multi-Agent Scheduler")
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Run every agent once as a single batch and exit",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print p50/p95/p99 duration and success rate per agent and exit",
+    )
+    parser.add_argument(
+        "--window",
+        default="24h",
+        help="Time window for --stats, e.g. 1h, 24h, 7d (default: 24h)",
+    )
+    args = parser.parse_args()
+
+    if args.stats:
+        print_stats(args.window)
+        return
+
     log_message("=" * 60)
     log_message("Browser-Use Multi-Agent Scheduler")
-    log_message(f"Interval: {INTERVAL_MINUTES} minutes")
+    log_message(f"Default interval: {INTERVAL_MINUTES} minutes")
+    log_message(f"Max concurrency: {MAX_CONCURRENCY}")
+    log_message(f"Execution mode: {EXECUTION_MODE}")
     log_message(f"Scripts directory: {SCRIPTS_DIR}")
     log_message("=" * 60)
 
     # Run the scheduler
-    asyncio.run(scheduler_loop())
+    try:
+        if args.once:
+            asyncio.run(run_once())
+        else:
+            asyncio.run(scheduler_loop())
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,192 @@
+"""
+Declarative agent metadata, read without importing the agent.
+
+Agents are tuned individually with a module-level dict of literals:
+
+    SCHEDULER = {
+        "schedule": "15m",          # interval or cron expression
+        "timeout": "10m",
+        "priority": 10,
+        "retries": 2,
+        "overlap": "queue",         # "skip", "queue" or "cancel"
+        "concurrency": "browser",   # concurrency class (SCHEDULER_CONCURRENCY_LIMITS)
+        "depends_on": ["gmail.py"],
+        "keep_browser_warm": True,
+        "in_process": False,
+    }
+
+The file is only parsed with ast, never imported, so reading it does not run
+load_dotenv() or import browser_use. Other module-level literal constants
+(DEPENDS_ON, KEEP_BROWSER_WARM, SCHEDULER_IN_PROCESS) are collected in the same
+pass. Values of the wrong type are reported as errors and left out, so the
+agent falls back to the defaults. Parsed metadata is cached by file
+modification time and size: looking up an unchanged agent costs a single
+stat() call. The same pass notes whether the agent defines a module-level
+main() or run(), which decides whether it can run in-process without ever
+importing an agent that does its work at import time.
+"""
+
+import ast
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Name of the module-level metadata dict
+METADATA_NAME = "SCHEDULER"
+
+# Accepted value types of each SCHEDULER key
+METADATA_TYPES: dict[str, tuple[type, ...]] = {
+    "schedule": (str, int, float),
+    "timeout": (str, int, float),
+    "priority": (int, str),
+    "retries": (int, str),
+    "overlap": (str,),
+    "concurrency": (str,),
+    "depends_on": (str, list, tuple),
+    "keep_browser_warm": (bool,),
+    "in_process": (bool,),
+}
+METADATA_KEYS = set(METADATA_TYPES)
+
+# Module-level functions the in-process mode calls
+ENTRY_POINTS = ("run", "main")
+
+# Standalone constants read as a fallback, with the key they stand in for
+LEGACY_CONSTANTS = {
+    "DEPENDS_ON": "depends_on",
+    "KEEP_BROWSER_WARM": "keep_browser_warm",
+    "SCHEDULER_IN_PROCESS": "in_process",
+}
+
+
+@dataclass
+class AgentMetadata:
+    """What an agent file declares about itself."""
+
+    # The SCHEDULER dict
+    settings: dict[str, Any] = field(default_factory=dict)
+    # Every module-level assignment of a literal value
+    constants: dict[str, Any] = field(default_factory=dict)
+    # Problems found while parsing (invalid syntax, unknown keys, ...)
+    errors: list[str] = field(default_factory=list)
+    # Module-level functions out of ENTRY_POINTS the agent defines
+    entry_points: set[str] = field(default_factory=set)
+    errors_logged: bool = False
+
+    def get(self, key: str, constant: str | None = None, default: Any = None) -> Any:
+        """A SCHEDULER setting, else the older standalone constant, else default."""
+        if key in self.settings:
+            return self.settings[key]
+        if constant is not None:
+            return self.constants.get(constant, default)
+        return default
+
+
+def parse_metadata(source: str, filename: str = "<agent>") -> AgentMetadata:
+    """Collect the module-level literal constants and SCHEDULER settings."""
+    metadata = AgentMetadata()
+    try:
+        tree = ast.parse(source, filename=filename)
+    except SyntaxError as e:
+        metadata.errors.append(f"syntax error on line {e.lineno}: {e.msg}")
+        return metadata
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.name in ENTRY_POINTS:
+                metadata.entry_points.add(node.name)
+            continue
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+
+        names = [target.id for target in targets if isinstance(target, ast.Name)]
+        if not names:
+            continue
+        try:
+            constant = ast.literal_eval(value)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            if METADATA_NAME in names:
+                metadata.errors.append(f"{METADATA_NAME} must only contain literals")
+            continue
+        for name in names:
+            metadata.constants[name] = constant
+
+    settings = metadata.constants.get(METADATA_NAME, {})
+    if not isinstance(settings, dict):
+        metadata.errors.append(f"{METADATA_NAME} must be a dict")
+        settings = {}
+    unknown = sorted(str(key) for key in settings.keys() - METADATA_KEYS)
+    if unknown:
+        metadata.errors.append(f"unknown {METADATA_NAME} key(s): {', '.join(unknown)}")
+    metadata.settings = {}
+    for key, value in settings.items():
+        if key not in METADATA_KEYS:
+            continue
+        problem = check_value(key, value)
+        if problem is not None:
+            # Left out, so the default applies
+            metadata.errors.append(f"{METADATA_NAME}[{key!r}] {problem}")
+            continue
+        metadata.settings[key] = value
+    for constant, key in LEGACY_CONSTANTS.items():
+        if constant in metadata.constants:
+            problem = check_value(key, metadata.constants[constant])
+            if problem is not None:
+                metadata.errors.append(f"{constant} {problem}")
+                del metadata.constants[constant]
+    return metadata
+
+
+def check_value(key: str, value: Any) -> str | None:
+    """Describe what is wrong with a metadata value, or None if it is valid."""
+    types = METADATA_TYPES[key]
+    # bool is an int, but True is no priority
+    if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+        names = " or ".join(t.__name__ for t in types)
+        return f"must be {names}, not {type(value).__name__}"
+    if isinstance(value, str) and not value.strip():
+        return "must not be empty"
+    if isinstance(value, (list, tuple)) and not all(
+        isinstance(item, str) for item in value
+    ):
+        return "must only contain agent file names"
+    return None
+
+
+# Parsed metadata by path, with the (mtime, size) it was parsed at
+_cache: dict[Path, tuple[tuple[int, int], AgentMetadata]] = {}
+
+
+def load_metadata(script_path: Path) -> AgentMetadata:
+    """Return an agent's metadata, parsing the file only when it has changed."""
+    try:
+        stat = script_path.stat()
+    except OSError:
+        _cache.pop(script_path, None)
+        return AgentMetadata()
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(script_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    try:
+        source = script_path.read_text()
+    except (OSError, UnicodeDecodeError) as e:
+        metadata = AgentMetadata(errors=[f"unreadable: {e}"])
+    else:
+        metadata = parse_metadata(source, str(script_path))
+    _cache[script_path] = (key, metadata)
+    return metadata
+
+
+def prune_metadata(script_paths: list[Path]):
+    """Forget cached metadata of agents that are gone."""
+    keep = set(script_paths)
+    for script_path in list(_cache):
+        if script_path not in keep:
+            del _cache[script_path]
@@ -0,0 +1,253 @@
+"""
+OpenMetrics endpoint for the scheduler.
+
+Metrics are plain in-memory counters updated once per run, and the text
+exposition is only built when /metrics is scraped, so collecting them adds
+no measurable per-run overhead. The HTTP server runs on the scheduler's own
+asyncio loop; no extra threads or dependencies are needed.
+
+Exposed metrics:
+- scheduler_run_duration_seconds: histogram of run durations per agent
+- scheduler_spawn_latency_seconds: histogram of run startup latency per agent
+- scheduler_admission_wait_seconds: histogram of time runs waited for admission
+- scheduler_schedule_lag_seconds: histogram of the delay between a run's planned
+  fire time and its actual start (queueing, admission and loop delay)
+- scheduler_runs_total: finished runs per agent and outcome (success/failure)
+- scheduler_concurrent_runs: runs executing right now
+- scheduler_queue_depth: runs waiting for a free worker
+- scheduler_admission_waiting: runs held back by admission control right now
+- scheduler_rate_limit_waiting: agent requests queued for a shared rate limit
+  token (sandbox creations, LLM calls)
+- scheduler_spent_today_dollars: cost agents reported today (daily budget)
+"""
+
+import asyncio
+from typing import Callable
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+DURATION_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LAG_BUCKETS = LATENCY_BUCKETS + (30, 60, 300)
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """Render labels as {name="value",...} with OpenMetrics escaping."""
+    if not labels:
+        return ""
+    rendered = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n")
+        value = value.replace('"', '\\"')
+        rendered.append(f'{name}="{value}"')
+    return "{" + ",".join(rendered) + "}"
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# TYPE {self.name} counter", f"# HELP {self.name} {self.help_text}"]
+        for key, value in self.values.items():
+            lines.append(f"{self.name}_total{format_labels(dict(key))} {value}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose value is read from a callback at scrape time."""
+
+    def __init__(self, name: str, help_text: str, read: Callable[[], float]):
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+
+    def render(self) -> list[str]:
+        return [
+            f"# TYPE {self.name} gauge",
+            f"# HELP {self.name} {self.help_text}",
+            f"{self.name} {self.read()}",
+        ]
+
+
+class Histogram:
+    """Cumulative histogram with labels."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self.values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        counts = self.values.get(key)
+        if counts is None:
+            counts = self.values[key] = [0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+        counts[-2] += 1
+        counts[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# TYPE {self.name} histogram",
+            f"# HELP {self.name} {self.help_text}",
+        ]
+        for key, counts in self.values.items():
+            labels = dict(key)
+            for bound, count in zip(self.buckets, counts):
+                bucket_labels = format_labels({**labels, "le": str(float(bound))})
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            inf_labels = format_labels({**labels, "le": "+Inf"})
+            lines.append(f"{self.name}_bucket{inf_labels} {counts[-2]}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {counts[-2]}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {counts[-1]}")
+        return lines
+
+
+class SchedulerMetrics:
+    """The scheduler's metrics and the HTTP server exposing them."""
+
+    def __init__(
+        self,
+        concurrent_runs: Callable[[], float],
+        queue_depth: Callable[[], float],
+        admission_waiting: Callable[[], float],
+        rate_limit_waiting: Callable[[], float],
+        spent_today: Callable[[], float],
+    ):
+        self.run_duration = Histogram(
+            "scheduler_run_duration_seconds",
+            "Duration of agent runs.",
+            DURATION_BUCKETS,
+        )
+        self.spawn_latency = Histogram(
+            "scheduler_spawn_latency_seconds",
+            "Time from dispatch until the agent reported its first message.",
+            LATENCY_BUCKETS,
+        )
+        self.admission_wait = Histogram(
+            "scheduler_admission_wait_seconds",
+            "Time runs waited for host resources before starting.",
+            DURATION_BUCKETS,
+        )
+        self.schedule_lag = Histogram(
+            "scheduler_schedule_lag_seconds",
+            "Delay between a run's planned fire time and its actual start.",
+            LAG_BUCKETS,
+        )
+        self.runs = Counter("scheduler_runs", "Finished agent runs by outcome.")
+        self.metrics = [
+            self.run_duration,
+            self.spawn_latency,
+            self.admission_wait,
+            self.schedule_lag,
+            self.runs,
+            Gauge(
+                "scheduler_concurrent_runs",
+                "Agent runs executing right now.",
+                concurrent_runs,
+            ),
+            Gauge(
+                "scheduler_queue_depth",
+                "Agent runs waiting for a free worker.",
+                queue_depth,
+            ),
+            Gauge(
+                "scheduler_admission_waiting",
+                "Agent runs held back until host resources are available.",
+                admission_waiting,
+            ),
+            Gauge(
+                "scheduler_rate_limit_waiting",
+                "Agent requests waiting for a shared rate limit token.",
+                rate_limit_waiting,
+            ),
+            Gauge(
+                "scheduler_spent_today_dollars",
+                "Cost agents reported today, counted against the daily budget.",
+                spent_today,
+            ),
+        ]
+        self._server: asyncio.Server | None = None
+
+    def record_run(
+        self,
+        agent: str,
+        success: bool,
+        duration: float,
+        spawn_latency: float,
+        admission_wait: float,
+        schedule_lag: float,
+    ):
+        """Update the per-run metrics (a handful of dict updates)."""
+        self.run_duration.observe(duration, agent=agent)
+        self.spawn_latency.observe(spawn_latency, agent=agent)
+        self.admission_wait.observe(admission_wait, agent=agent)
+        self.schedule_lag.observe(schedule_lag, agent=agent)
+        self.runs.inc(agent=agent, outcome="success" if success else "failure")
+
+    def render(self) -> str:
+        """Build the OpenMetrics text exposition."""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            # Skip the headers; this endpoint does not need any of them
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request_line.decode(errors="replace").split()
+            if (
+                len(parts) >= 2
+                and parts[0] == "GET"
+                and parts[1].split("?")[0] == "/metrics"
+            ):
+                status, content_type, body = "200 OK", CONTENT_TYPE, self.render()
+            else:
+                status, content_type, body = (
+                    "404 Not Found",
+                    "text/plain",
+                    "Not Found\n",
+                )
+
+            payload = body.encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode()
+                + payload
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int):
+        """Start serving /metrics on the running event loop."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def close(self):
+        """Stop the HTTP server."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
@@ -0,0 +1,80 @@
+"""
+Retries and circuit breakers for scheduled agents.
+
+A failed run is retried within the same tick after an exponentially growing,
+fully jittered delay, so agents that fail together do not retry in lockstep.
+A circuit breaker per agent stops scheduling it after a number of
+consecutive failures; once the cooldown has passed a single probe run is let
+through (half-open) and its outcome decides whether the agent is scheduled
+normally again or stays paused for another cooldown.
+"""
+
+import random
+import time
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(self, base_delay: float, max_delay: float):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before retrying after failed attempt number `attempt`."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Per-agent circuit breaker.
+
+    States:
+    - closed: runs normally, counting consecutive failures
+    - open: not scheduled until `cooldown` seconds after it opened
+    - half_open: one probe run is in flight; success closes the circuit,
+      failure opens it again
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Whether a new scheduled run may start now."""
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = "half_open"
+            return True
+        return False
+
+    def record(self, success: bool) -> str | None:
+        """
+        Record the outcome of a run.
+
+        Returns:
+            str | None: The new state if the run changed it, else None
+        """
+        previous = self.state
+        if success:
+            self.failures = 0
+            self.state = "closed"
+        else:
+            self.failures += 1
+            if self.state == "half_open" or (
+                self.threshold > 0 and self.failures >= self.threshold
+            ):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+        return self.state if self.state != previous else None
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe run through."""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
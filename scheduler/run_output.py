@@ -0,0 +1,104 @@
+"""
+Capture of agent stdout/stderr for the scheduler.
+
+Output is read from the agent's pipe as soon as it is written, so a chatty
+agent can never fill the pipe and block. Every line goes to two places:
+- a bounded in-memory ring buffer, whose tail is attached to failed runs
+- a rotating per-agent log file (logs/<agent>.log, size-capped with backups)
+
+Lines longer than MAX_LINE_BYTES are split, so memory stays flat no matter
+how much (or how little newline-separated) output an agent produces.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import AsyncIterator
+
+MAX_LINE_BYTES = 4096
+READ_CHUNK_BYTES = 64 * 1024
+
+
+async def iter_lines(reader: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    """Yield lines from a stream, splitting any line over MAX_LINE_BYTES."""
+    buffer = bytearray()
+    while chunk := await reader.read(READ_CHUNK_BYTES):
+        buffer.extend(chunk)
+        while True:
+            newline = buffer.find(b"\n", 0, MAX_LINE_BYTES + 1)
+            if newline >= 0:
+                yield bytes(buffer[:newline])
+                del buffer[: newline + 1]
+            elif len(buffer) > MAX_LINE_BYTES:
+                yield bytes(buffer[:MAX_LINE_BYTES])
+                del buffer[:MAX_LINE_BYTES]
+            else:
+                break
+    if buffer:
+        yield bytes(buffer)
+
+
+def agent_logger(
+    directory: Path, script_name: str, max_bytes: int, backups: int
+) -> logging.Logger:
+    """Return the logger writing to an agent's rotating log file."""
+    logger = logging.getLogger(f"scheduler.agents.{script_name}")
+    if not logger.handlers:
+        directory.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            directory / f"{script_name}.log",
+            maxBytes=max_bytes,
+            backupCount=backups,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        # Agent output belongs in its own file, not the scheduler's console
+        logger.propagate = False
+    return logger
+
+
+class RunOutput:
+    """Output of one agent run: a ring buffer of recent lines plus a log file."""
+
+    def __init__(
+        self,
+        script_name: str,
+        tail_lines: int = 50,
+        logger: logging.Logger | None = None,
+    ):
+        self.script_name = script_name
+        self.lines: deque[str] = deque(maxlen=tail_lines)
+        self.logger = logger
+        self.total_lines = 0
+
+    def start(self, run_id: str):
+        """Mark the start of a run in the log file."""
+        if self.logger is not None:
+            self.logger.info(f"--- run {run_id} started ---")
+
+    def add_line(self, line: bytes):
+        """Record one line of output."""
+        text = line.decode(errors="replace").rstrip("\r")
+        self.lines.append(text)
+        self.total_lines += 1
+        if self.logger is not None:
+            self.logger.info(text)
+
+    async def read(self, reader: asyncio.StreamReader):
+        """Record output from a pipe until it is closed."""
+        async for line in iter_lines(reader):
+            self.add_line(line)
+
+    def tail(self) -> str:
+        """The most recent lines, ready to attach to a failed run."""
+        if not self.lines:
+            return ""
+        skipped = self.total_lines - len(self.lines)
+        header = f"Last {len(self.lines)} line(s) of output"
+        if skipped:
+            header += f" ({skipped} earlier line(s) omitted)"
+        return header + ":\n" + "\n".join(self.lines)
@@ -0,0 +1,186 @@
+"""
+Per-agent schedules for the scheduler.
+
+Each agent runs on its own cadence, described either as a fixed interval
+("30s", "15m", "2h", or plain seconds) or as a standard five-field cron
+expression ("*/5 * * * *"). Schedules work on the monotonic clock so fire
+times are not affected by wall-clock jumps, and intervals are fixed-rate:
+the next run is planned from the previous planned fire time, not from when
+the previous run finished.
+
+Schedules can carry a start offset (see stagger_offset) that shifts every fire
+time by a fixed, per-agent amount, so agents sharing a cadence don't all start
+in the same instant.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+
+INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class IntervalSchedule:
+    """Fire every N seconds."""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError(f"Interval must be positive, got {seconds}")
+        self.seconds = seconds
+        self.offset = 0.0
+
+    def next_fire(self, previous: float | None, now: float) -> float:
+        """Return the next monotonic fire time after `previous`."""
+        if previous is None:
+            return now + self.offset
+
+        # Skip ticks that were missed entirely instead of firing them in a burst
+        next_fire = previous + self.seconds
+        if next_fire <= now:
+            missed = int((now - next_fire) // self.seconds) + 1
+            next_fire += missed * self.seconds
+        return next_fire
+
+    def __str__(self) -> str:
+        return f"every {self.seconds:g}s{format_offset(self.offset)}"
+
+
+class CronSchedule:
+    """Fire on a five-field cron expression (minute hour day month weekday)."""
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+    # Longest length of each month (February has 29 days in leap years)
+    MONTH_DAYS = [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+
+        self.expression = expression
+        self.offset = 0.0
+        parsed = [
+            self._parse_field(value, low, high)
+            for value, (low, high) in zip(fields, self.FIELD_RANGES)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Both 0 and 7 mean Sunday
+        self.weekdays = {day % 7 for day in weekdays}
+        # Standard cron: if both day fields are restricted, either may match
+        self.days_restricted = fields[2] != "*"
+        self.weekdays_restricted = fields[4] != "*"
+
+        # Every weekday occurs in every month, so only a day-of-month
+        # restriction alone can rule out all dates (e.g. "0 0 31 2 *")
+        if self.days_restricted and not self.weekdays_restricted:
+            if not any(min(self.days) <= self.MONTH_DAYS[m - 1] for m in self.months):
+                raise ValueError(f"Cron expression never fires: {expression!r}")
+
+    @staticmethod
+    def _parse_field(value: str, low: int, high: int) -> set[int]:
+        values = set()
+        for part in value.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+                if step <= 0:
+                    raise ValueError(f"Invalid cron step: {value!r}")
+
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron field {value!r} out of range {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        # datetime.weekday() is Monday=0, cron is Sunday=0
+        weekday_match = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def next_datetime(self, after: datetime) -> datetime:
+        """Return the first matching wall-clock minute strictly after `after`."""
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+
+        while moment < limit:
+            if moment.month not in self.months:
+                # Jump to the first day of the next month
+                moment = (moment.replace(day=1) + timedelta(days=32)).replace(
+                    day=1, hour=0, minute=0
+                )
+                continue
+            if not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+                continue
+            if moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+                continue
+            return moment
+
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+    def next_fire(self, previous: float | None, now: float) -> float:
+        """Return the next monotonic fire time for the next cron match."""
+        # Match against a clock running `offset` behind, so each fire lands
+        # `offset` seconds after the cron minute
+        wall_now = datetime.now() - timedelta(seconds=self.offset)
+        earliest = wall_now
+        if previous is not None:
+            # Never fire twice for the same cron minute, even if the monotonic
+            # and wall clocks disagree slightly about when the last run fired
+            earliest += timedelta(seconds=max(0.0, previous + 30 - now))
+        delay = (self.next_datetime(earliest) - wall_now).total_seconds()
+        return now + max(0.0, delay)
+
+    def __str__(self) -> str:
+        return f"cron '{self.expression}'{format_offset(self.offset)}"
+
+
+def format_offset(offset: float) -> str:
+    return f" (+{offset:.1f}s)" if offset else ""
+
+
+def stagger_offset(name: str, window: float) -> float:
+    """
+    Deterministic start offset for an agent within [0, window).
+
+    Derived from a hash of the agent name, so an agent keeps its offset across
+    restarts and on every node, and agents spread evenly over the window.
+    """
+    if window <= 0:
+        return 0.0
+    digest = hashlib.sha256(name.encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64 * window
+
+
+def parse_duration(value: str) -> float:
+    """Parse a duration such as "30s", "15m", "2h" or plain seconds."""
+    value = value.strip()
+    if not value:
+        raise ValueError("Empty duration")
+    unit = value[-1].lower()
+    if unit in INTERVAL_UNITS:
+        return float(value[:-1]) * INTERVAL_UNITS[unit]
+    return float(value)
+
+
+def parse_schedule(value: str) -> IntervalSchedule | CronSchedule:
+    """Parse an interval ("15m", "300") or a cron expression into a schedule."""
+    value = value.strip()
+    if len(value.split()) == 5:
+        return CronSchedule(value)
+    return IntervalSchedule(parse_duration(value))
@@ -0,0 +1,181 @@
+"""
+Warm cloud browser sessions kept alive between scheduler ticks.
+
+Provisioning a cloud browser and logging in with a profile's cookies takes a
+large part of a short agent run. For agents that opt in, the scheduler keeps
+one Browser Use Cloud browser session per profile alive between their runs
+and hands it to the next run through SCHEDULER_BROWSER_CDP_URL (the agent
+connects with Browser(cdp_url=...), see agents/_runtime.py).
+
+- A session is used by one run at a time; a run that finds the profile's
+  session busy provisions its own sandbox as usual.
+- Before a session is handed out it is health-checked through the cloud API,
+  and it is replaced shortly before its cloud timeout is reached.
+- Sessions not used for the idle TTL are stopped, so a paused or removed
+  agent doesn't keep a browser running.
+- A run that fails gets a fresh session next time, in case the browser was
+  left in a bad state.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import httpx
+
+API_URL = os.getenv("SCHEDULER_BROWSER_API_URL", "https://api.browser-use.com/api/v2")
+
+# Replace a session this long before its cloud timeout instead of handing it out
+TIMEOUT_MARGIN_SECONDS = 5 * 60
+
+
+@dataclass
+class BrowserSession:
+    """A cloud browser session owned by the scheduler."""
+
+    id: str
+    cdp_url: str
+    live_url: str
+    profile_id: str | None
+    expires_at: float
+    last_used: float
+    busy: bool = False
+
+
+class BrowserSessionPool:
+    """One warm cloud browser session per profile, reused across runs."""
+
+    def __init__(
+        self,
+        api_key: str,
+        idle_ttl: float,
+        session_timeout_minutes: int = 60,
+        proxy_country_code: str | None = None,
+        before_create: Callable[[], Awaitable[bool]] | None = None,
+    ):
+        self.idle_ttl = idle_ttl
+        self.session_timeout_minutes = session_timeout_minutes
+        self.proxy_country_code = proxy_country_code
+        # Awaited before every new session, e.g. to wait for a rate limit;
+        # returns False if no session may be created right now
+        self.before_create = before_create
+        self.sessions: dict[str | None, BrowserSession] = {}
+        self._client = httpx.AsyncClient(
+            base_url=API_URL,
+            headers={"X-Browser-Use-API-Key": api_key},
+            timeout=30,
+        )
+        self._reaper: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    def start(self):
+        """Start stopping sessions that have been idle for the idle TTL."""
+        self._reaper = asyncio.create_task(self._reap())
+
+    async def _create(self, profile_id: str | None) -> BrowserSession | None:
+        """Start a session, or return None if `before_create` denies it."""
+        body = {"timeout": self.session_timeout_minutes}
+        if profile_id:
+            body["profileId"] = profile_id
+        if self.proxy_country_code:
+            body["proxyCountryCode"] = self.proxy_country_code
+
+        if self.before_create is not None and not await self.before_create():
+            return None
+        response = await self._client.post("/browsers", json=body)
+        response.raise_for_status()
+        # Raises ValueError for a non-JSON body, TypeError/KeyError if malformed
+        data = response.json()
+        now = time.monotonic()
+        return BrowserSession(
+            id=data["id"],
+            cdp_url=data["cdpUrl"],
+            live_url=data.get("liveUrl", ""),
+            profile_id=profile_id,
+            expires_at=now + self.session_timeout_minutes * 60,
+            last_used=now,
+        )
+
+    async def _stop(self, session: BrowserSession):
+        try:
+            await self._client.patch(f"/browsers/{session.id}", json={"action": "stop"})
+        except httpx.HTTPError:
+            pass
+
+    async def _healthy(self, session: BrowserSession) -> bool:
+        """Whether the cloud still reports the session as active."""
+        if session.expires_at - time.monotonic() < TIMEOUT_MARGIN_SECONDS:
+            return False
+        try:
+            response = await self._client.get(f"/browsers/{session.id}")
+        except httpx.HTTPError:
+            return False
+        if not response.is_success:
+            return False
+        try:
+            data = response.json()
+        except ValueError:
+            return False
+        return isinstance(data, dict) and data.get("status") == "active"
+
+    async def acquire(
+        self, profile_id: str | None
+    ) -> tuple[BrowserSession | None, bool]:
+        """
+        Take the warm session of a profile, creating it if there is none.
+
+        Returns:
+            tuple: (session, reused) - session is None if the profile's session
+            is busy with another run, could not be created, or its creation
+            was denied by `before_create`
+        """
+        async with self._lock:
+            session = self.sessions.get(profile_id)
+            if session is not None and session.busy:
+                return None, False
+
+            if session is not None and not await self._healthy(session):
+                del self.sessions[profile_id]
+                await self._stop(session)
+                session = None
+
+            reused = session is not None
+            if session is None:
+                try:
+                    session = await self._create(profile_id)
+                except (httpx.HTTPError, KeyError, TypeError, ValueError):
+                    return None, False
+                if session is None:
+                    return None, False
+                self.sessions[profile_id] = session
+
+            session.busy = True
+            return session, reused
+
+    async def release(self, session: BrowserSession, healthy: bool = True):
+        """Return a session after a run; unhealthy sessions are stopped."""
+        session.busy = False
+        session.last_used = time.monotonic()
+        if not healthy:
+            if self.sessions.get(session.profile_id) is session:
+                del self.sessions[session.profile_id]
+            await self._stop(session)
+
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(min(60.0, max(1.0, self.idle_ttl / 4)))
+            now = time.monotonic()
+            for profile_id, session in list(self.sessions.items()):
+                if not session.busy and now - session.last_used >= self.idle_ttl:
+                    del self.sessions[profile_id]
+                    await self._stop(session)
+
+    async def close(self):
+        """Stop every session."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+        await asyncio.gather(*(self._stop(s) for s in self.sessions.values()))
+        self.sessions.clear()
+        await self._client.aclose()
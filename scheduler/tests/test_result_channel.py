@@ -0,0 +1,67 @@
+"""
+Large results must survive the result channel in every execution mode.
+
+Run from the scheduler directory: python -m unittest discover tests
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+SCHEDULER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCHEDULER_DIR))
+
+# No log files or history database; nothing to preload in workers
+os.environ["SCHEDULER_LOG_DIR"] = ""
+os.environ["SCHEDULER_HISTORY_DB"] = ""
+os.environ["SCHEDULER_WORKER_PRELOAD"] = ""
+
+import main  # noqa: E402
+
+RESULT_BYTES = 5 * 1024 * 1024
+
+AGENT = f"""
+from _channel import report_progress, report_result
+
+report_progress("about to report a large result")
+report_result(True, "x" * {RESULT_BYTES})
+"""
+
+
+class LargeResultTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        shutil.copy(SCHEDULER_DIR / "agents" / "_channel.py", self.directory)
+        self.script = self.directory / "large_result.py"
+        self.script.write_text(AGENT)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_agent(self, run) -> "main.RunResult":
+        async def run_and_shut_down():
+            try:
+                # A channel that stops reading blocks the agent forever
+                return await asyncio.wait_for(run(self.script), timeout=60)
+            finally:
+                await main.shutdown_executors()
+
+        return asyncio.run(run_and_shut_down())
+
+    def assert_large_result(self, result):
+        self.assertTrue(result.success, str(result.output)[:500])
+        self.assertEqual(len(result.output), RESULT_BYTES)
+
+    def test_subprocess(self):
+        self.assert_large_result(self.run_agent(main.run_script_subprocess))
+
+    def test_worker(self):
+        self.assert_large_result(self.run_agent(main.run_script_worker))
+
+
+if __name__ == "__main__":
+    unittest.main()
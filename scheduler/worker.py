@@ -0,0 +1,285 @@
+"""
+Pre-warmed worker processes for the scheduler.
+
+A worker is a long-lived Python process that imports the heavy agent
+dependencies (browser_use, dotenv) once at startup and then runs agent
+scripts one at a time as they are sent to it. Jobs arrive as JSON lines on
+stdin ({"run_id", "script", "env"}) and the worker answers with JSON lines
+on a dedicated pipe (SCHEDULER_WORKER_FD), so anything the agent prints can
+never corrupt the protocol. The same pipe is the running agent's result
+channel (see agents/_channel.py), so agent messages arrive in between.
+
+Messages sent by the worker:
+- {"type": "ready", "pid": ...} once the preloaded imports are done
+- {"type": "started", "run_id": ...} right before the script runs
+- {"type": "finished", "run_id": ..., "returncode": ..., "rss_mb": ...}
+
+The worker's stdout and stderr share one pipe to the scheduler, which
+attributes the output to the job currently running. After each job the
+worker flushes and writes an end-of-job marker line to that pipe, so the
+scheduler knows when it has seen all of the job's output.
+
+This file is started by the scheduler (`python worker.py`); the
+WorkerProcess class below is the scheduler-side handle for one worker.
+"""
+
+import asyncio
+import importlib
+import json
+import os
+import runpy
+import signal
+import sys
+import traceback
+from pathlib import Path
+from typing import Callable
+
+from run_output import RunOutput, iter_lines
+
+# Modules imported once per worker instead of once per run
+PRELOAD_MODULES = [
+    name.strip()
+    for name in os.getenv("SCHEDULER_WORKER_PRELOAD", "dotenv,browser_use").split(",")
+    if name.strip()
+]
+
+# Written to stdout after each job; everything before it belongs to the job
+OUTPUT_END_MARKER = b"\x00scheduler-job-output-end"
+
+# Longest message line read from a result channel. Results (scraped mail,
+# posts, ...) are easily larger than asyncio's default limit of 64 KiB.
+CHANNEL_LINE_LIMIT = 256 * 1024 * 1024
+
+
+def current_rss_mb() -> float:
+    """Resident memory of this process in MB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    import resource
+
+    # ru_maxrss is KB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_job(script: Path, env: dict[str, str]) -> int:
+    """Run one agent script as __main__ and return its exit code."""
+    saved_env = dict(os.environ)
+    saved_cwd = os.getcwd()
+    saved_argv = sys.argv
+    saved_path = list(sys.path)
+
+    os.environ.clear()
+    os.environ.update(env)
+    os.chdir(script.parent)
+    sys.argv = [str(script)]
+    sys.path.insert(0, str(script.parent))
+
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+
+
+def serve():
+    """Worker process main loop: preload, then run jobs from stdin."""
+    channel_fd = int(os.environ["SCHEDULER_WORKER_FD"])
+
+    def send(message: dict):
+        os.write(channel_fd, (json.dumps(message) + "\n").encode())
+
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            print(f"Worker could not preload {name}: {e}", file=sys.stderr)
+
+    send({"type": "ready", "pid": os.getpid()})
+
+    for line in sys.stdin:
+        job = json.loads(line)
+        send({"type": "started", "run_id": job["run_id"]})
+        env = dict(job["env"], SCHEDULER_RESULT_FD=str(channel_fd))
+        returncode = run_job(Path(job["script"]), env)
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.write(sys.stdout.fileno(), OUTPUT_END_MARKER + b"\n")
+
+        send(
+            {
+                "type": "finished",
+                "run_id": job["run_id"],
+                "returncode": returncode,
+                "rss_mb": current_rss_mb(),
+            }
+        )
+
+
+async def kill_process_tree(process: asyncio.subprocess.Process, grace: float = 5):
+    """
+    Stop a process started with start_new_session=True and all its children.
+
+    The whole process group gets SIGTERM, then SIGKILL if it is still alive
+    after `grace` seconds, so browsers or helpers the agent started die too.
+    """
+    if process.returncode is not None:
+        return
+
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(process.wait(), timeout=grace)
+        except asyncio.TimeoutError:
+            os.killpg(process.pid, signal.SIGKILL)
+            await process.wait()
+    except ProcessLookupError:
+        pass
+
+
+class WorkerProcess:
+    """Scheduler-side handle for one pre-warmed worker process."""
+
+    def __init__(
+        self, process: asyncio.subprocess.Process, reader: asyncio.StreamReader
+    ):
+        self.process = process
+        self.reader = reader
+        self.jobs_run = 0
+        self.rss_mb = 0.0
+        # Output capture of the job currently running (None between jobs)
+        self.output: RunOutput | None = None
+        self._output_done = asyncio.Event()
+        self._output_task = asyncio.create_task(self._read_output())
+
+    @classmethod
+    async def spawn(cls) -> "WorkerProcess":
+        """Start a worker and wait until its preloaded imports are done."""
+        read_fd, write_fd = os.pipe()
+        env = dict(os.environ, SCHEDULER_WORKER_FD=str(write_fd))
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                str(Path(__file__).resolve()),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                env=env,
+                pass_fds=(write_fd,),
+                start_new_session=True,
+            )
+        finally:
+            os.close(write_fd)
+
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=CHANNEL_LINE_LIMIT)
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(read_fd, "rb")
+        )
+
+        worker = cls(process, reader)
+        ready = await worker._receive()
+        if ready.get("type") != "ready":
+            await worker.close()
+            raise RuntimeError(f"Worker failed to start: {ready}")
+        return worker
+
+    async def _read_output(self):
+        """Route the worker's stdout/stderr to the job that produced it."""
+        async for line in iter_lines(self.process.stdout):
+            if line == OUTPUT_END_MARKER:
+                self._output_done.set()
+            elif self.output is not None:
+                self.output.add_line(line)
+            else:
+                # Printed outside a job (e.g. a failed preload)
+                print(
+                    f"[worker {self.process.pid}] {line.decode(errors='replace')}",
+                    file=sys.stderr,
+                )
+        self._output_done.set()
+
+    async def _receive(self) -> dict:
+        line = await self.reader.readline()
+        if not line:
+            raise RuntimeError(
+                f"Worker {self.process.pid} exited (code {self.process.returncode})"
+            )
+        return json.loads(line)
+
+    async def run(
+        self,
+        run_id: str,
+        script: Path,
+        env: dict[str, str],
+        on_message: Callable[[dict], None],
+        output: RunOutput | None = None,
+    ) -> dict:
+        """
+        Send a job to the worker and wait until it finishes.
+
+        Messages the agent reports on its result channel are passed to
+        `on_message` as they arrive; its stdout/stderr goes to `output`.
+
+        Returns:
+            dict: The worker's "finished" message
+        """
+        job = {"run_id": run_id, "script": str(script), "env": env}
+        self.output = output
+        self._output_done.clear()
+        try:
+            self.process.stdin.write((json.dumps(job) + "\n").encode())
+            await self.process.stdin.drain()
+
+            while True:
+                message = await self._receive()
+                if message.get("type") == "finished":
+                    break
+                if message.get("type") != "started":
+                    on_message(message)
+
+            # The end-of-job marker is written before "finished", but on
+            # another pipe - wait until the output reader has caught up
+            try:
+                await asyncio.wait_for(self._output_done.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            self.output = None
+
+        self.jobs_run += 1
+        self.rss_mb = message.get("rss_mb", 0.0)
+        return message
+
+    async def close(self):
+        """Stop the worker, killing it if it doesn't exit on its own."""
+        if self.process.returncode is None:
+            self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        self._output_task.cancel()
+
+
+if __name__ == "__main__":
+    serve()
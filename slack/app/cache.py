@@ -0,0 +1,61 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+def normalize_task(task: str) -> str:
+    """Cache key of a task: case, spacing and trailing punctuation don't count."""
+    return re.sub(r"\s+", " ", task).strip().rstrip("?!. ").lower()
+
+
+def format_age(seconds: float) -> str:
+    """Human-readable age, e.g. "3 minutes"."""
+    for unit, size in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= size:
+            count = int(seconds // size)
+            return f"{count} {unit}{'s' if count != 1 else ''}"
+    return "less than a minute"
+
+
+class ResultCache:
+    """Results of recent tasks, kept for `ttl` seconds.
+
+    Holds at most `max_entries` results and evicts the least recently used
+    one when full. A task containing `bypass_keyword` is always run again
+    (and its new result replaces the cached one).
+    """
+
+    def __init__(self, ttl: float, max_entries: int, bypass_keyword: str):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass_keyword = bypass_keyword
+        # key -> (result, time stored), least recently used first
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    def strip_bypass(self, task: str) -> tuple[str, bool]:
+        """Remove the bypass keyword from a task; returns (task, bypassed)."""
+        pattern = rf"(?<!\S){re.escape(self.bypass_keyword)}(?!\S)"
+        stripped, count = re.subn(pattern, " ", task, flags=re.IGNORECASE)
+        return (re.sub(r"\s+", " ", stripped).strip(), True) if count else (task, False)
+
+    def get(self, task: str) -> Optional[tuple[str, float]]:
+        """Return (result, age in seconds) of a fresh cached result, or None."""
+        key = normalize_task(task)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        result, stored_at = entry
+        age = time.monotonic() - stored_at
+        if age > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result, age
+
+    def put(self, task: str, result: str):
+        key = normalize_task(task)
+        self._entries[key] = (result, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
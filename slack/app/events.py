@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class EventDeduplicator:
+    """Remembers the event IDs seen in the last `ttl` seconds.
+
+    Slack redelivers an event (with the same event_id) when it was not
+    acknowledged within 3 seconds, up to three times over about five minutes.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        # event_id -> expiry time, oldest first
+        self._seen: OrderedDict[str, float] = OrderedDict()
+
+    def seen(self, event_id: str) -> bool:
+        """Return True if the event was already seen, else remember it."""
+        now = time.monotonic()
+        while self._seen and next(iter(self._seen.values())) <= now:
+            self._seen.popitem(last=False)
+
+        if event_id in self._seen:
+            return True
+        self._seen[event_id] = now + self.ttl
+        return False
+
+    def forget(self, event_id: str):
+        """Let a redelivery of the event through (it was never handled)."""
+        self._seen.pop(event_id, None)
+
+
+class EventQueue:
+    """Bounded queue of Slack events, handled by a fixed number of workers."""
+
+    def __init__(
+        self,
+        handler: Callable[[dict], Awaitable[None]],
+        workers: int,
+        maxsize: int,
+    ):
+        self.handler = handler
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=maxsize)
+        self._workers = [asyncio.create_task(self._work()) for _ in range(workers)]
+
+    def submit(self, event_data: dict) -> bool:
+        """Queue an event without waiting; returns False if the queue is full."""
+        try:
+            self.queue.put_nowait(event_data)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def _work(self):
+        while True:
+            event_data = await self.queue.get()
+            try:
+                await self.handler(event_data)
+            except Exception as e:
+                logger.error(f"Error handling event: {str(e)}")
+            finally:
+                self.queue.task_done()
+
+    async def close(self):
+        """Stop the workers; events still queued are dropped."""
+        if self.queue.qsize():
+            logger.warning(f"Dropping {self.queue.qsize()} queued event(s)")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
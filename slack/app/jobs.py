@@ -0,0 +1,129 @@
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class Job:
+    """A browser task requested in Slack."""
+
+    def __init__(self, task: str, channel: str, user: str):
+        self.task = task
+        self.channel = channel
+        self.user = user
+        # Position in the queue last reported to the user (None once started)
+        self.position: Optional[int] = None
+        # Posting of the message that shows the job's status, if any
+        self.reply: Optional[asyncio.Task] = None
+
+
+class FairTaskQueue:
+    """Runs at most `max_running` jobs at once, sharing turns fairly.
+
+    Waiting jobs are served round-robin over channels and, within a channel,
+    round-robin over users, so one busy channel or user can't hold every slot
+    while others wait. Every time the queue changes, `on_position(job, n)` is
+    called for each waiting job whose position changed.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[Job], Awaitable[None]],
+        on_position: Callable[[Job, int], Awaitable[None]],
+        max_running: int,
+        max_queued: int,
+    ):
+        self.run = run
+        self.on_position = on_position
+        self.max_running = max_running
+        self.max_queued = max_queued
+        # channel -> user -> waiting jobs; served and rotated from the front
+        self._queued: OrderedDict[str, OrderedDict[str, deque[Job]]] = OrderedDict()
+        self._queued_count = 0
+        # Strong references, so running tasks can't be garbage-collected
+        self._tasks: set[asyncio.Task] = set()
+        self._running = 0
+
+    def submit(self, job: Job) -> Optional[int]:
+        """
+        Start the job or queue it.
+
+        Returns:
+            int: 0 if the job started, its queue position if it is waiting,
+            or None if the queue is full
+        """
+        if self._running < self.max_running:
+            self._start(job)
+            return 0
+        if self._queued_count >= self.max_queued:
+            return None
+
+        users = self._queued.setdefault(job.channel, OrderedDict())
+        users.setdefault(job.user, deque()).append(job)
+        self._queued_count += 1
+        self._report_positions()
+        return job.position
+
+    def _order(self) -> list[Job]:
+        """The waiting jobs in the order they will start."""
+        channels = deque(
+            deque(deque(jobs) for jobs in users.values())
+            for users in self._queued.values()
+        )
+        order = []
+        while channels:
+            users = channels.popleft()
+            jobs = users.popleft()
+            order.append(jobs.popleft())
+            if jobs:
+                users.append(jobs)
+            if users:
+                channels.append(users)
+        return order
+
+    def _next(self) -> Job:
+        channel, users = next(iter(self._queued.items()))
+        user, jobs = next(iter(users.items()))
+        job = jobs.popleft()
+        if jobs:
+            users.move_to_end(user)
+        else:
+            del users[user]
+        if users:
+            self._queued.move_to_end(channel)
+        else:
+            del self._queued[channel]
+        self._queued_count -= 1
+        return job
+
+    def _report_positions(self):
+        for position, job in enumerate(self._order(), start=1):
+            if job.position != position:
+                job.position = position
+                self.spawn(self.on_position(job, position))
+
+    def spawn(self, coro: Awaitable) -> asyncio.Task:
+        """Run a coroutine in the background, keeping it referenced until done."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _start(self, job: Job):
+        job.position = None
+        self._running += 1
+        self.spawn(self._run(job))
+
+    async def _run(self, job: Job):
+        try:
+            await self.run(job)
+        except Exception as e:
+            logger.error(f"Error running task in {job.channel}: {str(e)}")
+        finally:
+            self._running -= 1
+            if self._queued:
+                self._start(self._next())
+                self._report_positions()
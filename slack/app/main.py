@@ -1,9 +1,15 @@
 import os
 import json
 import logging
+from contextlib import asynccontextmanager
+import aiohttp
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from slack_sdk.signature import SignatureVerifier
+from slack_sdk.web.async_client import AsyncWebClient
+from cache import ResultCache
+from events import EventDeduplicator, EventQueue
+from outbound import SlackOutbox
 from service import SlackService
 from dotenv import load_dotenv
 
@@ -13,15 +19,59 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-app = FastAPI()
+# Workers handling queued Slack events, and how many events may wait for one
+EVENT_WORKERS = int(os.getenv("SLACK_EVENT_WORKERS", "4"))
+EVENT_QUEUE_SIZE = int(os.getenv("SLACK_EVENT_QUEUE_SIZE", "100"))
+# How long an event_id is remembered to drop Slack's redeliveries (seconds)
+EVENT_DEDUPE_TTL = float(os.getenv("SLACK_EVENT_DEDUPE_TTL", "3600"))
+# Browser tasks running at once, and how many may wait for a free slot
+MAX_CONCURRENT_TASKS = int(os.getenv("SLACK_MAX_CONCURRENT_TASKS", "3"))
+MAX_QUEUED_TASKS = int(os.getenv("SLACK_MAX_QUEUED_TASKS", "20"))
+# Seconds a task's result is reused for the same task (0 disables the cache),
+# how many results are kept, and the word that skips the cache
+RESULT_CACHE_TTL = float(os.getenv("SLACK_RESULT_CACHE_TTL", "0"))
+RESULT_CACHE_SIZE = int(os.getenv("SLACK_RESULT_CACHE_SIZE", "100"))
+CACHE_BYPASS_KEYWORD = os.getenv("SLACK_CACHE_BYPASS_KEYWORD", "!fresh")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create one Slack client (and HTTP session) and the event workers."""
+    app.state.events = None
+    access_token = os.getenv("SLACK_ACCESS_TOKEN")
+    if not access_token:
+        yield
+        return
+
+    async with aiohttp.ClientSession() as session:
+        client = AsyncWebClient(token=access_token, session=session)
+        cache = None
+        if RESULT_CACHE_TTL > 0:
+            cache = ResultCache(
+                RESULT_CACHE_TTL, RESULT_CACHE_SIZE, CACHE_BYPASS_KEYWORD
+            )
+        slack_bot = SlackService(
+            SlackOutbox(client), MAX_CONCURRENT_TASKS, MAX_QUEUED_TASKS, cache
+        )
+        app.state.seen_events = EventDeduplicator(EVENT_DEDUPE_TTL)
+        app.state.events = EventQueue(
+            slack_bot.handle_event, EVENT_WORKERS, EVENT_QUEUE_SIZE
+        )
+        try:
+            yield
+        finally:
+            await app.state.events.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.post("/slack/events")
 async def slack_events(request: Request):
     try:
         signing_secret = os.getenv("SLACK_SIGNING_SECRET")
-        access_token = os.getenv("SLACK_ACCESS_TOKEN")
-        if not signing_secret or not access_token:
+        events = request.app.state.events
+        if not signing_secret or events is None:
             raise HTTPException(
                 status_code=500, detail="Required environment variables not configured"
             )
@@ -39,12 +89,23 @@ async def slack_events(request: Request):
         if "challenge" in event_data:
             return {"challenge": event_data["challenge"]}
 
-        slack_bot = SlackService(access_token)
+        # Acknowledge right away: Slack redelivers events not acked within 3s
         if "event" in event_data:
-            try:
-                await slack_bot.handle_event(event_data)
-            except Exception as e:
-                logger.error(f"Error handling event: {str(e)}")
+            event_id = event_data.get("event_id")
+            if not event_id:
+                logger.warning("Event ID missing in event data")
+                return {}
+
+            if request.app.state.seen_events.seen(event_id):
+                retry_num = request.headers.get("X-Slack-Retry-Num")
+                logger.info(f"Ignoring duplicate event {event_id} (retry {retry_num})")
+                return {}
+
+            if not events.submit(event_data):
+                # Not acked, so Slack delivers it again later
+                request.app.state.seen_events.forget(event_id)
+                logger.warning(f"Event queue full, rejecting event {event_id}")
+                raise HTTPException(status_code=503, detail="Event queue full")
 
         return {}
     except HTTPException:
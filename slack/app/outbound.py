@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Requests per minute allowed by each Slack Web API rate limit tier
+TIER_RATES = {1: 1, 2: 20, 3: 50, 4: 100}
+
+# Tier of the methods this app calls (https://api.slack.com/methods)
+METHOD_TIERS = {
+    "chat.update": 3,
+    "chat.delete": 3,
+    "reactions.add": 3,
+    "conversations.replies": 3,
+    "users.info": 4,
+}
+
+# chat.postMessage is limited per channel to about one message per second
+POST_MESSAGE_INTERVAL = 1.0
+
+# How often a call is retried after Slack answered 429
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+class Pacer:
+    """Spaces out calls that share a rate limit; callers are served in order."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            delay = self.next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_at = time.monotonic() + self.interval
+
+    def pause(self, seconds: float):
+        """Hold every queued call back for `seconds` (Slack's Retry-After)."""
+        self.next_at = max(self.next_at, time.monotonic() + seconds)
+
+
+class PendingUpdate:
+    """A chat.update still waiting in the queue; later updates replace its text."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.future = asyncio.get_running_loop().create_future()
+        # Callers whose update was coalesced into this one, awaiting `future`
+        self.waiters = 0
+
+
+class SlackOutbox:
+    """Outbound Slack calls through one pooled client and a rate-limited queue.
+
+    The client is created once for the app's lifetime (see the lifespan in
+    main.py), so every call reuses the same HTTP session and its connections.
+    Calls are paced per Slack rate limit (chat.postMessage per channel, other
+    methods by their tier), a 429 pauses the whole queue for its Retry-After,
+    and chat.update calls to the same message that are still queued are
+    coalesced into one call with the latest text.
+    """
+
+    def __init__(self, client: AsyncWebClient):
+        self.client = client
+        self._pacers: dict[tuple, Pacer] = {}
+        self._updates: dict[tuple[str, str], PendingUpdate] = {}
+        # Updates whose first caller was cancelled, sent on behalf of the others
+        self._handoffs: set[asyncio.Task] = set()
+
+    def _pacer(self, method: str, channel: Optional[str] = None) -> Pacer:
+        if method == "chat.postMessage":
+            key, interval = (method, channel), POST_MESSAGE_INTERVAL
+        else:
+            tier = METHOD_TIERS.get(method, 2)
+            key, interval = (method,), 60 / TIER_RATES[tier]
+        pacer = self._pacers.get(key)
+        if pacer is None:
+            pacer = self._pacers[key] = Pacer(interval)
+        return pacer
+
+    async def call(self, method: str, **params):
+        """Call a Web API method (e.g. "chat.postMessage") through the queue."""
+        return await self._send(method, params.get("channel"), lambda: params)
+
+    async def _send(
+        self, method: str, channel: Optional[str], prepare, superseded=None
+    ):
+        """
+        Wait for the method's turn, then call it with the params from `prepare()`.
+
+        After a 429, `superseded()` may return the future of a newer call that
+        made this one redundant; that call's response is returned instead of
+        retrying.
+        """
+        pacer = self._pacer(method, channel)
+        call = getattr(self.client, method.replace(".", "_"))
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await pacer.wait()
+            try:
+                return await call(**prepare())
+            except SlackApiError as e:
+                if e.response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                    raise
+                retry_after = float(e.response.headers.get("Retry-After", 1))
+                logger.warning(f"Rate limited on {method}, retrying in {retry_after}s")
+                pacer.pause(retry_after)
+
+                newer = superseded() if superseded is not None else None
+                if newer is not None:
+                    return await asyncio.shield(newer)
+
+    async def post_message(
+        self, channel: str, text: str, thread_ts: Optional[str] = None
+    ):
+        return await self.call(
+            "chat.postMessage", channel=channel, text=text, thread_ts=thread_ts
+        )
+
+    async def update_message(self, channel: str, ts: str, text: str):
+        key = (channel, ts)
+        pending = self._updates.get(key)
+        if pending is not None:
+            # An update of this message is still queued: send our text instead
+            pending.text = text
+            pending.waiters += 1
+            return await asyncio.shield(pending.future)
+
+        pending = self._updates[key] = PendingUpdate(text)
+        try:
+            return await self._deliver(key, pending)
+        except asyncio.CancelledError:
+            if pending.waiters:
+                # Others coalesced onto this update: send it for them
+                handoff = asyncio.create_task(self._handoff(key, pending))
+                self._handoffs.add(handoff)
+                handoff.add_done_callback(self._handoffs.discard)
+            else:
+                if self._updates.get(key) is pending:
+                    del self._updates[key]
+                pending.future.cancel()
+            raise
+
+    async def _handoff(self, key: tuple[str, str], pending: PendingUpdate):
+        newer = self._updates.get(key)
+        if newer is not None and newer is not pending:
+            # Already sent (and interrupted); a newer update has the latest text
+            try:
+                pending.future.set_result(await asyncio.shield(newer.future))
+            except asyncio.CancelledError:
+                pending.future.cancel()
+            except Exception as e:
+                pending.future.set_exception(e)
+            return
+        try:
+            await self._deliver(key, pending)
+        except Exception:
+            # Already passed on to the waiters through the future
+            pass
+
+    async def _deliver(self, key: tuple[str, str], pending: PendingUpdate):
+        """Send a queued update and resolve its future with the response."""
+        channel, ts = key
+
+        def prepare():
+            # Once sent the text is fixed; later updates queue a new call
+            if self._updates.get(key) is pending:
+                del self._updates[key]
+            return {"channel": channel, "ts": ts, "text": pending.text}
+
+        def superseded():
+            newer = self._updates.get(key)
+            return newer.future if newer is not None else None
+
+        try:
+            response = await self._send("chat.update", channel, prepare, superseded)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if self._updates.get(key) is pending:
+                del self._updates[key]
+            pending.future.set_exception(e)
+            # Only coalesced callers await the future; there may be none
+            pending.future.exception()
+            raise
+        pending.future.set_result(response)
+        return response
@@ -0,0 +1,85 @@
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable, Optional
+
+# Prefix of the log lines the sandboxed agent writes after each step
+PROGRESS_MARKER = "SLACK_PROGRESS "
+
+
+def parse_progress(message: str) -> Optional[dict]:
+    """Read the step info from a sandbox log line, if it is a progress line."""
+    start = message.find(PROGRESS_MARKER)
+    if start == -1:
+        return None
+    try:
+        return json.loads(message[start + len(PROGRESS_MARKER) :])
+    except json.JSONDecodeError:
+        return None
+
+
+def format_progress(task: str, progress: dict) -> str:
+    """Status message text for a running task."""
+    lines = [
+        f"🔄 Working on: {task}",
+        f"Step {progress.get('step')}/{progress.get('max_steps')}",
+    ]
+    if progress.get("actions"):
+        lines[-1] += f" · {', '.join(progress['actions'])}"
+    if progress.get("url"):
+        lines.append(f"🌐 {progress['url']}")
+    return "\n".join(lines)
+
+
+class ThrottledMessage:
+    """Keeps a Slack message showing the latest text, editing it at most once
+    per `interval` seconds; texts set in between are coalesced into one edit.
+    """
+
+    def __init__(self, update: Callable[[str], Awaitable], interval: float):
+        self.update = update
+        self.interval = interval
+        self._latest: Optional[str] = None
+        self._sent_at = 0.0
+        self._flush: Optional[asyncio.Task] = None
+        # Whether the flush task is sending (rather than waiting its turn)
+        self._sending = False
+        self._closed = False
+
+    def set(self, text: str):
+        if self._closed:
+            return
+        self._latest = text
+        if self._flush is None:
+            self._flush = asyncio.create_task(self._send_later())
+
+    async def _send_later(self):
+        try:
+            delay = self._sent_at + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            text, self._latest = self._latest, None
+            self._sent_at = time.monotonic()
+            self._sending = True
+            await self.update(text)
+        finally:
+            self._sending = False
+            self._flush = None
+            # A text set while the edit was being sent goes out next
+            if self._latest is not None:
+                self._flush = asyncio.create_task(self._send_later())
+
+    async def close(self):
+        """Drop pending edits, e.g. before the message shows the final result.
+
+        An edit already being sent is allowed to finish, so it can't land
+        after (or take down) the edit that follows.
+        """
+        self._closed = True
+        self._latest = None
+        flush = self._flush
+        if flush is None:
+            return
+        if not self._sending:
+            flush.cancel()
+        await asyncio.gather(flush, return_exceptions=True)
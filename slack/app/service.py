@@ -4,21 +4,41 @@ import os
 import re
 from typing import Optional
 from slack_sdk.errors import SlackApiError
-from slack_sdk.web.async_client import AsyncWebClient
 from browser_use import Agent, Browser, ChatBrowserUse, sandbox
 from browser_use.sandbox.views import BrowserCreatedData
+from cache import ResultCache, format_age
+from jobs import FairTaskQueue, Job
+from outbound import SlackOutbox
+from progress import (
+    PROGRESS_MARKER,
+    ThrottledMessage,
+    format_progress,
+    parse_progress,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
 class SlackService:
-    def __init__(self, access_token: str):
-        """Initialize SlackService with Slack access token.
+    def __init__(
+        self,
+        outbox: SlackOutbox,
+        max_running: int,
+        max_queued: int,
+        cache: Optional[ResultCache] = None,
+    ):
+        """Initialize SlackService with the app's shared Slack outbox.
 
+        At most `max_running` browser tasks run at once and `max_queued` wait.
+        Repeated tasks are answered from `cache`, if given.
         Note: BROWSER_USE_API_KEY is automatically loaded from environment.
         """
-        self.access_token = access_token
+        self.outbox = outbox
+        self.cache = cache
+        self.tasks = FairTaskQueue(
+            self.run_job, self.show_queue_position, max_running, max_queued
+        )
 
     def format_for_slack(self, text: str) -> str:
         """Convert markdown-style text to Slack-friendly format"""
@@ -28,12 +48,14 @@ class SlackService:
         text = text.replace("**", "*")
         return text
 
+    def format_result(self, task: str, result: str) -> str:
+        return f"✅ Task completed!\n\n📝 Task: {task}\n\n🎯 Result:\n{self.format_for_slack(result)}"
+
     async def send_message(
         self, channel: str, text: str, thread_ts: Optional[str] = None
     ):
         try:
-            client = AsyncWebClient(token=self.access_token)
-            response = await client.chat_postMessage(
+            response = await self.outbox.post_message(
                 channel=channel, text=text, thread_ts=thread_ts
             )
             return response
@@ -42,8 +64,9 @@ class SlackService:
 
     async def update_message(self, channel: str, ts: str, text: str):
         try:
-            client = AsyncWebClient(token=self.access_token)
-            response = await client.chat_update(channel=channel, ts=ts, text=text)
+            response = await self.outbox.update_message(
+                channel=channel, ts=ts, text=text
+            )
             return response
         except SlackApiError as e:
             logger.error(f"Error updating message: {e.response['error']}")
@@ -73,6 +96,10 @@ class SlackService:
                 else:
                     return
 
+                bypass_cache = False
+                if self.cache is not None:
+                    task, bypass_cache = self.cache.strip_bypass(task)
+
                 # Only process if there's actually a task
                 if not task:
                     await self.send_message(
@@ -82,17 +109,68 @@ class SlackService:
                     )
                     return
 
-                # Start the async task to process the agent task
-                asyncio.create_task(self.process_agent_task_async(task, channel_id))
+                # Answer a task asked recently from the cache
+                cached = None
+                if self.cache is not None and not bypass_cache:
+                    cached = self.cache.get(task)
+                if cached is not None:
+                    result, age = cached
+                    await self.send_message(
+                        channel_id,
+                        f"{self.format_result(task, result)}\n\n"
+                        f"♻️ Cached answer, {format_age(age)} old. Add "
+                        f"`{self.cache.bypass_keyword}` to run the task again.",
+                    )
+                    return
+
+                # Start the task, or queue it until a browser is free
+                job = Job(task, channel_id, event.get("user") or "")
+                if self.tasks.submit(job) is None:
+                    await self.send_message(
+                        channel_id,
+                        "🚦 Too many tasks are waiting. Try again in a few minutes.",
+                        thread_ts=event.get("ts"),
+                    )
 
         except Exception as e:
             logger.error(f"Error in handle_event: {str(e)}")
 
-    async def process_agent_task_async(self, task: str, channel_id: str):
-        """Async function to process the agent task"""
+    async def show_queue_position(self, job: Job, position: int):
+        """Tell a waiting user their place in the queue, updating one message"""
+        text = (
+            f"⏳ You are #{position} in queue. Your task starts when a browser is free."
+        )
+        if job.reply is None:
+            job.reply = self.tasks.spawn(self.send_message(job.channel, text))
+            return
+
+        response = await job.reply
+        if response and response.get("ok"):
+            await self.update_message(job.channel, response["ts"], text)
+
+    async def run_job(self, job: Job):
+        await self.process_agent_task_async(job.task, job.channel, job.reply)
+
+    async def process_agent_task_async(
+        self, task: str, channel_id: str, reply: Optional[asyncio.Task] = None
+    ):
+        """Async function to process the agent task
+
+        `reply` is the posting of the task's queue position message, if it
+        had to wait; that message becomes the status message.
+        """
+        progress = None
         try:
             # Send initial "starting" message and capture its timestamp
-            response = await self.send_message(channel_id, "Starting browser task...")
+            response = await reply if reply is not None else None
+            if response and response.get("ok"):
+                await self.update_message(
+                    channel_id, response["ts"], "Starting browser task..."
+                )
+            else:
+                response = await self.send_message(
+                    channel_id, "Starting browser task..."
+                )
             if not response or not response.get("ok"):
                 logger.error(f"Failed to send initial message: {response}")
                 return
@@ -104,6 +182,12 @@ class SlackService:
 
             # Get profile_id from environment (optional)
             profile_id = os.getenv("BROWSER_USE_PROFILE_ID")
+            # Step limit, and the minimum seconds between progress edits
+            max_steps = int(os.getenv("SLACK_MAX_STEPS", "100"))
+            progress = ThrottledMessage(
+                lambda text: self.update_message(channel_id, message_ts, text),
+                float(os.getenv("SLACK_PROGRESS_INTERVAL", "5")),
+            )
 
             # Callback to capture browser session info
             def on_browser_created(data: BrowserCreatedData):
@@ -112,36 +196,74 @@ class SlackService:
                 logger.info(f"✅ Captured Live URL: {data.live_url}")
 
                 # Send live URL to Slack immediately
-                asyncio.create_task(
+                self.tasks.spawn(
                     self.send_message(channel_id, f"📺 Live session: {data.live_url}")
                 )
 
+            # Callback receiving the sandbox's logs, including step progress
+            def on_log(log):
+                step = parse_progress(getattr(log, "message", str(log)))
+                if step is not None:
+                    progress.set(format_progress(task, step))
+
             # Create standalone function for sandbox decorator
             @sandbox(
                 log_level="INFO",
                 cloud_timeout=30,
                 cloud_profile_id=profile_id,
                 on_browser_created=on_browser_created,
+                on_log=on_log,
             )
-            async def execute_task(browser: Browser, task_description: str):
+            async def execute_task(
+                browser: Browser, task_description: str, max_steps: int, marker: str
+            ):
                 """Execute browser task in sandbox"""
+                import json
+                import logging
+
+                # Runs in the cloud: report each step through the streamed logs
+                progress_logger = logging.getLogger("browser_use.slack_progress")
+
+                async def on_step_end(agent: Agent):
+                    step = agent.history.history[-1]
+                    actions = []
+                    if step.model_output:
+                        for action in step.model_output.action:
+                            actions.extend(action.model_dump(exclude_unset=True))
+                    progress_logger.info(
+                        marker
+                        + json.dumps(
+                            {
+                                "step": len(agent.history.history),
+                                "max_steps": max_steps,
+                                "url": step.state.url,
+                                "actions": actions,
+                            }
+                        )
+                    )
+
                 agent = Agent(
                     browser=browser, task=task_description, llm=ChatBrowserUse()
                 )
-                result = await agent.run()
+                result = await agent.run(max_steps=max_steps, on_step_end=on_step_end)
                 return result.final_result()
 
             # Execute task
-            result = await execute_task(task_description=task)
-
-            # Format result for Slack
-            formatted_result = self.format_for_slack(result)
+            result = await execute_task(
+                task_description=task, max_steps=max_steps, marker=PROGRESS_MARKER
+            )
+            await progress.close()
+            if self.cache is not None and result:
+                self.cache.put(task, result)
 
-            # Send final result
-            final_message = f"✅ Task completed!\n\n📝 Task: {task}\n\n🎯 Result:\n{formatted_result}"
-            await self.update_message(channel_id, message_ts, final_message)
+            # Send final result, formatted for Slack
+            await self.update_message(
+                channel_id, message_ts, self.format_result(task, result)
+            )
 
         except Exception as e:
+            if progress is not None:
+                await progress.close()
             error_message = f"Error during task execution: {str(e)}"
             logger.error(f"Error in process_agent_task_async: {error_message}")
 